@@ -53,7 +53,7 @@ from django_flex.views import FlexQueryView
 from django_flex.decorators import flex_query
 
 # Response utilities
-from django_flex.response import FlexResponse, build_nested_response
+from django_flex.response import FlexResponse, build_nested_response, build_nested_response_batch
 
 # Configuration
 from django_flex.conf import flex_settings
@@ -87,6 +87,7 @@ __all__ = [
     # Response
     "FlexResponse",
     "build_nested_response",
+    "build_nested_response_batch",
     # Settings
     "flex_settings",
 ]
@@ -24,10 +24,17 @@ DEFAULTS = {
     "MAX_RELATION_DEPTH": 2,
     "REQUIRE_AUTHENTICATION": True,
     "AUDIT_QUERIES": False,
+    "MAX_BODY_BYTES": 1024 * 1024,  # Larger request bodies are rejected before parsing (None = no limit)
     # Token authentication (H1 fix: configurable session model)
     "SESSION_MODEL": None,  # e.g., 'myapp.models.Session' - None disables token auth
     "SESSION_TOKEN_FIELD": "token",  # Field name for token lookup
     "SESSION_USER_FIELD": "user",  # Field name for user relation
+    # Optional: only load these user columns with the session, e.g.
+    # ['id', 'email', 'is_active', 'is_staff', 'is_superuser']. Reading any other
+    # user field later costs an extra query, so list everything the request uses.
+    "SESSION_USER_ONLY_FIELDS": None,
+    "SESSION_TOKEN_PATTERN": r"[A-Za-z0-9_\-.~+/=]{1,512}",  # Tokens not fully matching are rejected without a query
+    "SESSION_CACHE_TIMEOUT": 0,  # Seconds to cache token -> user lookups in-process (0 = disabled)
     # CSRF protection (H2 fix: secure by default)
     "CSRF_EXEMPT": False,  # Set True ONLY for token-only APIs (no session auth)
     # Response behavior
@@ -45,6 +52,24 @@ DEFAULTS = {
 }
 
 
+def _snapshot(value):
+    """
+    Copy dict/list/tuple/set containers recursively, keeping leaf values by reference.
+
+    Leaves such as a ROLE_RESOLVER callable may not be copyable at all, and
+    comparing them by reference is enough to notice a replaced value.
+    """
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_snapshot(item) for item in value)
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
 class FlexSettings:
     """
     A settings object that allows django-flex settings to be accessed as
@@ -64,30 +89,55 @@ class FlexSettings:
     def user_settings(self):
         if not hasattr(self, "_user_settings"):
             self._user_settings = getattr(settings, "DJANGO_FLEX", {})
+            # Copy the containers to detect in-place edits (nested PERMISSIONS too) on reload()
+            self._user_settings_snapshot = _snapshot(self._user_settings)
         return self._user_settings
 
     def __getattr__(self, attr):
         if attr not in self.defaults:
             raise AttributeError(f"Invalid django-flex setting: '{attr}'")
 
-        try:
-            # Check if present in user settings
+        # Snapshot every setting on first access so later reads are plain
+        # instance attribute lookups that never reach __getattr__
+        self._load()
+        return self.__dict__[attr]
+
+    def _load(self):
+        """Resolve all settings (user value or default) into instance attributes."""
+        user_settings = self.user_settings
+
+        for attr, default in self.defaults.items():
+            if attr in self.__dict__:
+                continue
+
             # EXPOSE in settings.py maps to PERMISSIONS internally
-            if attr == "PERMISSIONS" and "EXPOSE" in self.user_settings:
-                val = self.user_settings["EXPOSE"]
+            if attr == "PERMISSIONS" and "EXPOSE" in user_settings:
+                val = user_settings["EXPOSE"]
             else:
-                val = self.user_settings[attr]
-        except KeyError:
-            # Fall back to defaults
-            val = self.defaults[attr]
+                val = user_settings.get(attr, default)
 
-        # Cache the result
-        self._cached_attrs.add(attr)
-        setattr(self, attr, val)
-        return val
+            # Cache the result
+            self._cached_attrs.add(attr)
+            setattr(self, attr, val)
 
     def reload(self):
-        """Reload settings (useful for testing)."""
+        """
+        Reload settings (useful for testing).
+
+        Derived permission caches are always dropped. Resolved settings are
+        kept while DJANGO_FLEX is still the same, unmodified dict the current
+        snapshot was loaded from.
+        """
+        from django_flex.permissions import _clear_normalized_role_configs
+
+        _clear_normalized_role_configs()
+
+        loaded = self.__dict__.get("_user_settings")
+        if loaded is not None:
+            current = getattr(settings, "DJANGO_FLEX", {})
+            if (current is loaded or not (current or loaded)) and current == self._user_settings_snapshot:
+                return
+
         for attr in self._cached_attrs:
             try:
                 delattr(self, attr)
@@ -96,6 +146,7 @@ class FlexSettings:
         self._cached_attrs.clear()
         if hasattr(self, "_user_settings"):
             delattr(self, "_user_settings")
+            del self._user_settings_snapshot
 
 
 flex_settings = FlexSettings(DEFAULTS)
@@ -0,0 +1,67 @@
+"""
+Django-Flex JSON Utilities
+
+JSON encoding and decoding with an optional fast backend.
+
+Features:
+- Uses orjson when installed (pip install django-flex[fast])
+- Falls back to the standard library json module
+- Single JSONDecodeError type for both backends
+- Encodes the same types as Django's JsonResponse (DjangoJSONEncoder)
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Dates/times are handed to DjangoJSONEncoder so both backends format them the
+# same way; non-str dict keys are stringified as json.dumps does
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """
+    Decode a JSON document from bytes or str.
+
+    Args:
+        data: Raw JSON (e.g., request.body)
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        JSONDecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(obj):
+    """
+    Encode an object as UTF-8 JSON bytes for an HTTP response body.
+
+    Args:
+        obj: JSON-serializable object (plus anything DjangoJSONEncoder handles)
+
+    Returns:
+        Encoded JSON as bytes
+
+    Raises:
+        TypeError: If obj contains a value neither backend can encode
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_django_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, cls=DjangoJSONEncoder).encode()
@@ -11,18 +11,165 @@ Features:
 - Request/response logging (optional)
 """
 
-import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 
 from django.http import JsonResponse
 
+from django_flex import jsonutils
 from django_flex.query import FlexQuery, get_model_by_name
 from django_flex.response import FlexResponse
 from django_flex.conf import flex_settings
+from django_flex.permissions import clear_user_role_cache
 
 
 logger = logging.getLogger("django_flex")
 
+# Marker cached for tokens that matched no session
+_INVALID_TOKEN = object()
+
+# Invalid tokens are cached for at most this many seconds
+INVALID_TOKEN_CACHE_TIMEOUT = 10
+
+
+class TokenCache:
+    """
+    Process-local LRU of session token -> user with per-entry expiry.
+
+    Used by FlexQueryMiddleware when SESSION_CACHE_TIMEOUT is set, so repeated
+    requests with the same token skip the session query. Entries are cached
+    per process: call invalidate_token_cache() on logout, or keep the timeout
+    short, since a revoked token stays valid here until its entry expires.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Return the cached value for token, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return value
+
+    def set(self, token, value, timeout):
+        """Cache value for token for timeout seconds."""
+        with self._lock:
+            self._entries[token] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token=None):
+        """Drop one token, or every entry when token is None."""
+        with self._lock:
+            if token is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(token, None)
+
+
+_token_cache = TokenCache()
+
+
+# Matches a "__token" key in a raw JSON body without decoding it
+_BODY_TOKEN_RE = re.compile(rb'"__token"\s*:')
+
+
+def _peek_body_token(raw_body):
+    """Return True if the raw request body appears to carry a __token key."""
+    return bool(raw_body) and _BODY_TOKEN_RE.search(raw_body) is not None
+
+
+@lru_cache(maxsize=8)
+def _get_session_model(session_model_path):
+    """
+    Resolve SESSION_MODEL to a model class, once per distinct setting value.
+
+    Accepts 'myapp.models.Session' or 'myapp.Session'. Returns None (after
+    logging) for a malformed path; raises LookupError if the model is not
+    installed, which is not cached so a later request can retry.
+    """
+    from django.apps import apps
+
+    # Parse 'myapp.models.Session' -> app_label='myapp', model_name='Session'
+    parts = session_model_path.rsplit(".", 1)
+    if len(parts) != 2:
+        logger.error(f"Invalid SESSION_MODEL format: {session_model_path}")
+        return None
+
+    module_path, model_name = parts[0], parts[1]
+    # Handle 'myapp.models.Session' format
+    if ".models." in module_path or module_path.endswith(".models"):
+        app_label = module_path.split(".")[0]
+    else:
+        app_label = module_path
+
+    return apps.get_model(app_label, model_name)
+
+
+@lru_cache(maxsize=8)
+def _compile_token_pattern(pattern):
+    """Compile SESSION_TOKEN_PATTERN once per distinct pattern."""
+    return re.compile(pattern)
+
+
+def is_well_formed_token(token):
+    """
+    Cheap structural check run before any session lookup.
+
+    Returns False for non-string tokens or tokens that do not fully match
+    SESSION_TOKEN_PATTERN, so garbage tokens never reach the database.
+    """
+    if not isinstance(token, str):
+        return False
+    pattern = flex_settings.SESSION_TOKEN_PATTERN
+    if not pattern:
+        return True
+    return _compile_token_pattern(pattern).fullmatch(token) is not None
+
+
+def body_too_large(request):
+    """
+    Check the request body against MAX_BODY_BYTES.
+
+    The Content-Length header is checked first so oversize bodies are
+    rejected without being read.
+    """
+    max_bytes = flex_settings.MAX_BODY_BYTES
+    if not max_bytes:
+        return False
+
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except (TypeError, ValueError):
+        content_length = 0
+    if content_length > max_bytes:
+        return True
+
+    return len(request.body) > max_bytes
+
+
+def invalidate_token_cache(token=None):
+    """
+    Forget a cached session token (e.g., on logout), or all tokens if None.
+
+    Only needed when SESSION_CACHE_TIMEOUT is enabled.
+    """
+    _token_cache.invalidate(token)
+
 
 class FlexQueryMiddleware:
     """
@@ -143,12 +290,15 @@ class FlexQueryMiddleware:
         if not action:
             return FlexResponse.error("INVALID_ACTION", f"HTTP method {request.method} not supported").to_json_response()
 
+        if self._body_too_large(request):
+            return FlexResponse.error("PAYLOAD_TOO_LARGE").to_json_response()
+
         # Parse JSON body if present
         body = {}
         if request.body:
             try:
-                body = json.loads(request.body)
-            except json.JSONDecodeError:
+                body = jsonutils.loads(request.body)
+            except jsonutils.JSONDecodeError:
                 # Only allow truly empty bodies to pass (for GET/DELETE)
                 # Non-empty invalid JSON should return an error
                 if request.body.strip():
@@ -237,35 +387,47 @@ class FlexQueryMiddleware:
 
     def handle_flex_query(self, request, version_config=None):
         """Handle a flex query request with optional version-specific settings."""
-        # Parse request body first (needed for __token resolution)
+        if self._body_too_large(request):
+            return FlexResponse.error("PAYLOAD_TOO_LARGE").to_json_response()
+
+        # Requests that cannot possibly authenticate are rejected before parsing the body
+        require_auth = self._get_setting("REQUIRE_AUTHENTICATION", version_config)
+        if require_auth and not self._may_authenticate(request):
+            return FlexResponse.error("PERMISSION_DENIED", "Authentication required").to_json_response()
+
+        # Parse request body (needed for __token resolution)
         try:
-            body = json.loads(request.body)
-        except json.JSONDecodeError:
+            body = jsonutils.loads(request.body)
+        except jsonutils.JSONDecodeError:
             return FlexResponse.error("INVALID_FILTER", "Invalid JSON body").to_json_response()
 
         # Resolve user from Authorization header (Bearer token) or __token in body
         self._resolve_user_from_token(request, body)
 
         # Check authentication if required (after token resolution)
-        require_auth = self._get_setting("REQUIRE_AUTHENTICATION", version_config)
         if require_auth:
             if not hasattr(request, "user") or not request.user.is_authenticated:
                 return FlexResponse.error("PERMISSION_DENIED", "Authentication required").to_json_response()
 
-        return self._handle_flex_query_internal(request, version_config, body)
+        return self._handle_flex_query_internal(request, version_config, body, user_resolved=True)
 
-    def _handle_flex_query_internal(self, request, version_config, body):
-        """Internal handler for flex queries - shared by both JSON body and RESTful approaches."""
-        # Note: _resolve_user_from_token is called in handle_flex_query
-        # For RESTful requests, we need to resolve it here
-        if not hasattr(request, "user") or request.user is None or request.user.is_anonymous:
-            self._resolve_user_from_token(request, body)
+    def _handle_flex_query_internal(self, request, version_config, body, user_resolved=False):
+        """
+        Internal handler for flex queries - shared by both JSON body and RESTful approaches.
 
-        # Check authentication if required
-        require_auth = self._get_setting("REQUIRE_AUTHENTICATION", version_config)
-        if require_auth:
-            if not hasattr(request, "user") or not request.user.is_authenticated:
-                return FlexResponse.error("PERMISSION_DENIED", "Authentication required").to_json_response()
+        user_resolved=True means the caller already resolved the token and
+        enforced REQUIRE_AUTHENTICATION, so neither is repeated here.
+        """
+        if not user_resolved:
+            # RESTful requests resolve the token and check authentication here
+            if not hasattr(request, "user") or request.user is None or request.user.is_anonymous:
+                self._resolve_user_from_token(request, body)
+
+            # Check authentication if required
+            require_auth = self._get_setting("REQUIRE_AUTHENTICATION", version_config)
+            if require_auth:
+                if not hasattr(request, "user") or not request.user.is_authenticated:
+                    return FlexResponse.error("PERMISSION_DENIED", "Authentication required").to_json_response()
 
         # Extract model and action
         model_name = body.get("_model")
@@ -319,6 +481,30 @@ class FlexQueryMiddleware:
         # Return response using to_json_response() which respects ALWAYS_HTTP_200 setting
         return result.to_json_response()
 
+    def _body_too_large(self, request):
+        """Check the request body against MAX_BODY_BYTES (see body_too_large)."""
+        return body_too_large(request)
+
+    def _may_authenticate(self, request):
+        """
+        Cheap pre-parse check: can this request end up authenticated?
+
+        True if the user is already authenticated (e.g., session auth), or if
+        token auth is configured and a Bearer header or a "__token" key in the
+        raw body is present. The token itself is validated later.
+        """
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return True
+
+        if not flex_settings.SESSION_MODEL:
+            return False
+
+        if self._extract_token(request):
+            return True
+
+        return _peek_body_token(request.body)
+
     def _resolve_user_from_token(self, request, body=None):
         """Resolve user from Authorization Bearer token or __token in request body."""
         # H1 fix: Check if token auth is configured
@@ -330,49 +516,83 @@ class FlexQueryMiddleware:
         if not token:
             return
 
-        try:
-            from django.apps import apps
-            from django.core.exceptions import ObjectDoesNotExist
+        # Malformed tokens can never match a session - skip the query
+        if not is_well_formed_token(token):
+            return
 
-            # Parse 'myapp.models.Session' -> app_label='myapp', model_name='Session'
-            parts = session_model_path.rsplit(".", 1)
-            if len(parts) != 2:
-                logger.error(f"Invalid SESSION_MODEL format: {session_model_path}")
+        cache_timeout = flex_settings.SESSION_CACHE_TIMEOUT
+        if cache_timeout:
+            cached = _token_cache.get(token)
+            if cached is _INVALID_TOKEN:
+                return
+            if cached is not None:
+                # The cached user outlives this request - drop roles memoized by the last one
+                clear_user_role_cache(cached)
+                request.user = cached
                 return
 
-            module_path, model_name = parts[0], parts[1]
-            # Handle 'myapp.models.Session' format
-            if ".models." in module_path or module_path.endswith(".models"):
-                app_label = module_path.split(".")[0]
-            else:
-                app_label = module_path
+        from django.core.exceptions import (
+            FieldDoesNotExist,
+            FieldError,
+            MultipleObjectsReturned,
+            ObjectDoesNotExist,
+            ValidationError,
+        )
+        from django.db import DatabaseError
 
-            SessionModel = apps.get_model(app_label, model_name)
+        try:
+            SessionModel = _get_session_model(session_model_path)
+            if SessionModel is None:
+                return
 
             token_field = flex_settings.SESSION_TOKEN_FIELD
             user_field = flex_settings.SESSION_USER_FIELD
 
-            session = SessionModel.objects.select_related(user_field).get(**{token_field: token})
+            queryset = SessionModel.objects.select_related(user_field)
+
+            # Optionally load only the user columns the project reads per request
+            user_only_fields = flex_settings.SESSION_USER_ONLY_FIELDS
+            if user_only_fields:
+                queryset = queryset.only(
+                    token_field, user_field, *(f"{user_field}__{name}" for name in user_only_fields)
+                )
+
+            session = queryset.get(**{token_field: token})
             request.user = getattr(session, user_field)
 
+            if cache_timeout:
+                _token_cache.set(token, request.user, cache_timeout)
+
         except LookupError as e:
             logger.error(f"SESSION_MODEL not found: {e}")
         except ObjectDoesNotExist:
-            pass  # Invalid token - expected case
-        except Exception as e:
+            # Invalid token - expected case
+            if cache_timeout:
+                _token_cache.set(token, _INVALID_TOKEN, min(cache_timeout, INVALID_TOKEN_CACHE_TIMEOUT))
+        except (
+            DatabaseError,
+            FieldDoesNotExist,
+            FieldError,
+            MultipleObjectsReturned,
+            ValidationError,
+            ValueError,
+        ) as e:
+            # Misconfigured or non-unique token field, unknown SESSION_USER_ONLY_FIELDS
+            # name, token not coercible to the field type, or DB failure - leave the
+            # request unauthenticated
             logger.warning(f"Token auth error: {type(e).__name__}: {e}")
 
     def _extract_token(self, request, body=None):
         """Extract token from Authorization header or request body."""
-        token = None
-
-        # First check Authorization header
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
+        # Authorization header first (dominant case) - one header lookup
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
             token = auth_header[7:]  # Remove "Bearer " prefix
+            if token:
+                return token
 
         # Fallback to __token in request body
-        if not token and body and "__token" in body:
-            token = body["__token"]
+        if body and isinstance(body, dict):
+            return body.get("__token")
 
-        return token
+        return None
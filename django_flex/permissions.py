@@ -25,11 +25,19 @@ Usage:
     queryset = Booking.objects.filter(row_filter)
 """
 
+import sys
+from functools import lru_cache
+
+from django.core.signals import setting_changed
 from django.db.models import Q
 
 from django_flex.conf import flex_settings
 from django_flex.filters import OPERATORS
 
+# Shared "no row filter" result; Q combinators (&, |, ~) return new objects, so
+# callers can filter with or combine it but must never mutate it in place
+_EMPTY_Q = Q()
+
 
 class FlexPermission:
     """
@@ -71,10 +79,14 @@ class FlexPermission:
         return []
 
 
+@lru_cache(maxsize=4096)
 def field_matches_pattern(field: str, pattern: str) -> bool:
     """
     Check if a field matches an allowed pattern.
 
+    Pure function of its two strings, so results are memoized; field/pattern
+    pairs come from schema and config and repeat across requests.
+
     Args:
         field: Field path to check (e.g., 'name', 'customer.email')
         pattern: Pattern to match against
@@ -102,20 +114,110 @@ def field_matches_pattern(field: str, pattern: str) -> bool:
 
     if pattern.endswith(".*"):
         # Relation wildcard: customer.* matches customer.name, customer.email
-        prefix = pattern[:-2]
-        return field.startswith(prefix + ".")
+        # (pattern minus the "*" is the "customer." prefix, dot included)
+        return field.startswith(pattern[:-1])
 
     # Exact match
     return field == pattern
 
 
+class FieldMatcher:
+    """
+    Compiled form of a role's field patterns.
+
+    Matches with the same rules as field_matches_pattern, but checks a field
+    against all patterns at once with set lookups instead of a pattern loop.
+
+    Example:
+        >>> matcher = FieldMatcher(["*", "customer.*", "owner.email"])
+        >>> matcher.allows("name"), matcher.allows("customer.name"), matcher.allows("owner.name")
+        (True, True, False)
+    """
+
+    __slots__ = ("exact", "prefixes", "star", "star_only", "exact_only")
+
+    def __init__(self, patterns):
+        self.exact = frozenset(p for p in patterns if p != "*" and not p.endswith(".*"))
+        self.prefixes = frozenset(p[:-2] for p in patterns if p.endswith(".*"))
+        self.star = "*" in patterns
+        # ["*"] alone - the most common config - allows exactly the non-nested fields
+        self.star_only = self.star and not self.exact and not self.prefixes
+        # Pure allowlist (no wildcards) - a field is allowed iff it is in exact
+        self.exact_only = not self.star and not self.prefixes
+
+    def __bool__(self):
+        # An empty matcher allows nothing (deny by default)
+        return bool(self.exact or self.prefixes or self.star)
+
+    def allows(self, field):
+        """Return True if field matches any of the compiled patterns."""
+        if field in self.exact:
+            return True
+
+        # "*" matches only base (non-nested) fields
+        if "." not in field:
+            return self.star
+
+        # Relation wildcard: walk up the dotted path (customer.address.city ->
+        # customer, customer.address) looking for a "<prefix>.*" pattern
+        if self.prefixes:
+            dot = field.find(".")
+            while dot != -1:
+                if field[:dot] in self.prefixes:
+                    return True
+                dot = field.find(".", dot + 1)
+
+        return False
+
+    def first_denied(self, fields):
+        """Return the first field not allowed, or None if all are allowed."""
+        if self.star_only:
+            for field in fields:
+                if "." in field:
+                    return field
+            return None
+
+        # One C-level subset check covers the common all-allowed case
+        if self.exact.issuperset(fields):
+            return None
+
+        if self.exact_only:
+            exact = self.exact
+            return next(field for field in fields if field not in exact)
+
+        allows = self.allows
+        for field in fields:
+            if not allows(field):
+                return field
+        return None
+
+
+@lru_cache(maxsize=256)
+def _compile_field_patterns(patterns):
+    """Build (and cache) a FieldMatcher for a tuple of patterns."""
+    return FieldMatcher(patterns)
+
+
+def compile_field_patterns(patterns):
+    """
+    Get the compiled FieldMatcher for a list of field patterns.
+
+    Args:
+        patterns: Iterable of field patterns (e.g., ["*", "customer.*"])
+
+    Returns:
+        FieldMatcher instance (shared for identical pattern lists)
+    """
+    return _compile_field_patterns(tuple(patterns))
+
+
 def fields_allowed(requested_fields, allowed_patterns):
     """
     Check if all requested fields are allowed by the patterns.
 
     Args:
         requested_fields: List of field names to check
-        allowed_patterns: List of allowed patterns
+        allowed_patterns: List of allowed patterns, or a compiled FieldMatcher
 
     Returns:
         Tuple of (is_allowed, denied_field)
@@ -126,18 +228,60 @@ def fields_allowed(requested_fields, allowed_patterns):
             return False, requested_fields[0]
         return True, None
 
-    for field in requested_fields:
-        allowed = False
-        for pattern in allowed_patterns:
-            if field_matches_pattern(field, pattern):
-                allowed = True
-                break
-        if not allowed:
-            return False, field
+    if isinstance(allowed_patterns, FieldMatcher):
+        matcher = allowed_patterns
+    else:
+        matcher = compile_field_patterns(allowed_patterns)
+
+    denied_field = matcher.first_denied(requested_fields)
+    if denied_field is not None:
+        return False, denied_field
     return True, None
 
 
+# Normalized role configs keyed by id(raw config). Each entry keeps the raw
+# config alive so its id cannot be reused by another object while cached.
+_NORMALIZED_ROLE_CONFIGS = {}
+_NORMALIZED_ROLE_CONFIGS_MAX = 1024
+
+
+# Flat (model, role, op) grant indexes keyed by id(permissions dict), same
+# keep-alive scheme as above
+_PERMISSION_INDEXES = {}
+_PERMISSION_INDEXES_MAX = 64
+
+
+def _clear_normalized_role_configs(setting=None, **kwargs):
+    """Drop cached role normalizations and grant indexes (connected to Django's setting_changed)."""
+    if setting is None or setting == "DJANGO_FLEX":
+        _NORMALIZED_ROLE_CONFIGS.clear()
+        _PERMISSION_INDEXES.clear()
+
+
+setting_changed.connect(_clear_normalized_role_configs)
+
+
 def normalize_role_config(perm):
+    """
+    Normalize a role permission config (cached per config object).
+
+    Role configs are treated as immutable: the normalized dict is computed
+    once per config object and shared, so callers must not mutate it.
+    """
+    entry = _NORMALIZED_ROLE_CONFIGS.get(id(perm))
+    if entry is not None and entry[0] is perm:
+        return entry[1]
+
+    normalized = _normalize_role_config(perm)
+
+    if len(_NORMALIZED_ROLE_CONFIGS) >= _NORMALIZED_ROLE_CONFIGS_MAX:
+        _NORMALIZED_ROLE_CONFIGS.clear()
+    _NORMALIZED_ROLE_CONFIGS[id(perm)] = (perm, normalized)
+
+    return normalized
+
+
+def _normalize_role_config(perm):
     """
     Normalize a role permission config.
 
@@ -149,16 +293,22 @@ def normalize_role_config(perm):
         perm: Role permission (string "*" or dict)
 
     Returns:
-        Normalized dict with all keys present
+        Normalized dict with all keys present, plus "_fields_matcher",
+        "_ops_set", "_filters_set" and "_order_set" (compiled forms of "fields",
+        "ops", "filters" and "order_by"; the last two stay "*" for full access)
     """
     # "*" shorthand = full access
     if perm == "*":
         return {
             "rows": "*",  # "*" means all rows (no filter)
             "fields": ["*"],  # "*" matches base fields only (not nested)
+            "_fields_matcher": compile_field_patterns(["*"]),
             "filters": "*",  # All filters allowed
+            "_filters_set": "*",
             "order_by": "*",  # All order_by allowed
+            "_order_set": "*",
             "ops": ["get", "list", "add", "edit", "delete"],
+            "_ops_set": frozenset(("get", "list", "add", "edit", "delete")),
         }
 
     # Empty or non-dict = no access (deny all)
@@ -166,21 +316,81 @@ def normalize_role_config(perm):
         return {
             "rows": lambda user: Q(pk=-1),  # Match nothing
             "fields": [],
+            "_fields_matcher": compile_field_patterns([]),
             "filters": [],
+            "_filters_set": frozenset(),
             "order_by": [],
+            "_order_set": frozenset(),
             "ops": [],
+            "_ops_set": frozenset(),
         }
 
     # Return as-is but with defaults for missing keys (empty = deny)
+    fields = perm.get("fields") or []
+    ops = perm.get("ops") or perm.get("operations") or []
+    filters = perm.get("filters") or []
+    order_by = perm.get("order_by") or []
     return {
         "rows": perm.get("rows") or None,
-        "fields": perm.get("fields") or [],
-        "filters": perm.get("filters") or [],
-        "order_by": perm.get("order_by") or [],
-        "ops": perm.get("ops") or perm.get("operations") or [],
+        "fields": fields,
+        "_fields_matcher": compile_field_patterns(fields),
+        "filters": filters,
+        "_filters_set": "*" if filters == "*" else _compile_ops(filters),
+        "order_by": order_by,
+        "_order_set": "*" if order_by == "*" else _compile_ops(order_by),
+        "ops": ops,
+        # Interned set forms of "ops", "filters" and "order_by" for O(1) checks
+        "_ops_set": _compile_ops(ops),
     }
 
 
+def permission_index(permissions):
+    """
+    Get the flat grant index for a permissions config (cached per config object).
+
+    Maps (model_name, role, action) to (normalized role config, is_star) for
+    every action a role is granted, so a permitted check is a single dict
+    lookup. Like role configs, the permissions dict is treated as immutable
+    once used.
+
+    Args:
+        permissions: Permissions dict ({model: {role: config}})
+
+    Returns:
+        Dict of (model_name, role, action) -> (perm, is_star)
+    """
+    entry = _PERMISSION_INDEXES.get(id(permissions))
+    if entry is not None and entry[0] is permissions:
+        return entry[1]
+
+    index = {}
+    for model_name, model_perms in permissions.items():
+        if not isinstance(model_perms, dict):
+            continue
+        for role, raw in model_perms.items():
+            perm = normalize_role_config(raw)
+            grant = (perm, raw == "*")
+            for action in perm["_ops_set"]:
+                index[(model_name, role, action)] = grant
+
+    if len(_PERMISSION_INDEXES) >= _PERMISSION_INDEXES_MAX:
+        _PERMISSION_INDEXES.clear()
+    _PERMISSION_INDEXES[id(permissions)] = (permissions, index)
+
+    return index
+
+
+def _compile_ops(names):
+    """Build the interned frozenset of allowed names ("get, list" strings are split)."""
+    if isinstance(names, str):
+        names = names.replace(",", " ").split()
+    return frozenset(sys.intern(name) for name in names if isinstance(name, str))
+
+
+# Attribute on the user object holding get_user_role results for this request
+_ROLE_CACHE_ATTR = "_flex_role_cache"
+
+
 def get_user_role(user, model_name=None, permissions=None):
     """
     Get the user's role for permission checking.
@@ -202,6 +412,11 @@ def get_user_role(user, model_name=None, permissions=None):
         Either:
         - Tuple of (role_name, row_filter) if resolver provides row filter
         - Role name string if no row filter from resolver
+
+    The result is memoized on the user object per (model_name, resolver), so
+    the permission, filter and order checks of one request share a single
+    resolution. Request users are rebuilt per request; callers that reuse a
+    user object across requests should call clear_user_role_cache().
     """
     if user is None:
         return "anon"
@@ -209,8 +424,44 @@ def get_user_role(user, model_name=None, permissions=None):
     if not user.is_authenticated:
         return "anon"
 
-    # Check for custom role resolver first
     resolver = flex_settings.ROLE_RESOLVER
+
+    role_cache = getattr(user, _ROLE_CACHE_ATTR, None)
+    if type(role_cache) is not dict:
+        role_cache = {}
+        try:
+            setattr(user, _ROLE_CACHE_ATTR, role_cache)
+        except AttributeError:
+            # Read-only user object - resolve without memoizing
+            pass
+
+    key = (model_name, resolver)
+    role = role_cache.get(key)
+    if role is None:
+        role = role_cache[key] = _resolve_user_role(user, model_name, resolver)
+    return role
+
+
+def clear_user_role_cache(user):
+    """
+    Drop roles memoized on a user object by get_user_role.
+
+    Args:
+        user: Django User instance
+    """
+    try:
+        delattr(user, _ROLE_CACHE_ATTR)
+    except AttributeError:
+        pass
+
+
+# Built-in role by (is_superuser << 1) | is_staff; None falls through to groups
+_DEFAULT_ROLE_TABLE = (None, "staff", "superuser", "superuser")
+
+
+def _resolve_user_role(user, model_name, resolver):
+    """Resolve an authenticated user's role (uncached body of get_user_role)."""
+    # Check for custom role resolver first
     if resolver and callable(resolver):
         result = resolver(user, model_name)
         if result:
@@ -223,12 +474,10 @@ def get_user_role(user, model_name=None, permissions=None):
             else:
                 return result.lower()
 
-    # Default role resolution
-    if user.is_superuser:
-        return "superuser"
-
-    if user.is_staff:
-        return "staff"
+    # Default role resolution: superuser, then staff
+    role = _DEFAULT_ROLE_TABLE[(bool(user.is_superuser) << 1) | bool(user.is_staff)]
+    if role is not None:
+        return role
 
     # Use Django's built-in groups
     if hasattr(user, "groups"):
@@ -283,8 +532,6 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
     if model_name not in permissions:
         raise PermissionError(f"Access denied: model '{model_name}' not configured")
 
-    model_perms = permissions[model_name]
-
     # H3 fix: Handle anonymous users via 'anon' role
     is_anonymous = user is None or not getattr(user, "is_authenticated", False)
 
@@ -292,8 +539,6 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
         # Anonymous user - must have 'anon' role configured
         role = "anon"
         resolver_row_filter = None
-        if role not in model_perms:
-            raise PermissionError(f"Anonymous access denied: no 'anon' role configured for '{model_name}'")
     else:
         # Get user's role (may return tuple with row_filter)
         role_result = get_user_role(user, model_name, permissions)
@@ -304,25 +549,37 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
         else:
             role = role_result
 
-    if not role:
-        raise PermissionError("No role could be determined for user")
+    # Client-supplied actions must be strings before the hashed index lookup
+    if not isinstance(action, str):
+        raise PermissionError(f"Access denied: invalid operation {action!r}")
 
-    # Check if role has access to this model
-    if role not in model_perms:
-        raise PermissionError(f"Access denied: role '{role}' cannot access '{model_name}'")
+    grant = permission_index(permissions).get((model_name, role, action))
+    if grant is None:
+        # Not granted - work out which check fails (or apply the superuser bypass)
+        model_perms = permissions[model_name]
 
-    # Normalize the role config (handles "*" shorthand and empty {})
-    perm = normalize_role_config(model_perms[role])
+        if is_anonymous and role not in model_perms:
+            raise PermissionError(f"Anonymous access denied: no 'anon' role configured for '{model_name}'")
 
-    # Superuser with "*" config bypasses remaining checks
-    if not is_anonymous and user.is_superuser and model_perms[role] == "*":
-        return Q(), requested_fields
+        if not role:
+            raise PermissionError("No role could be determined for user")
+
+        # Check if role has access to this model
+        if role not in model_perms:
+            raise PermissionError(f"Access denied: role '{role}' cannot access '{model_name}'")
+
+        # Superuser with "*" config bypasses remaining checks
+        if not is_anonymous and user.is_superuser and model_perms[role] == "*":
+            return _EMPTY_Q, requested_fields
 
-    # Check if operation is allowed
-    allowed_ops = perm["ops"]
-    if action not in allowed_ops:
         raise PermissionError(f"Access denied: operation '{action}' not allowed on '{model_name}'")
 
+    perm, is_star = grant
+
+    # Superuser with "*" config bypasses remaining checks
+    if is_star and not is_anonymous and user.is_superuser:
+        return _EMPTY_Q, requested_fields
+
     # H5 fix: Check field depth against MAX_RELATION_DEPTH
     max_depth = flex_settings.MAX_RELATION_DEPTH
     for field in requested_fields:
@@ -332,7 +589,7 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
             raise PermissionError(f"Field '{field}' exceeds max relation depth of {max_depth}")
 
     # Check if all requested fields are allowed
-    allowed_fields = perm["fields"]
+    allowed_fields = perm["_fields_matcher"]
     is_allowed, denied_field = fields_allowed(requested_fields, allowed_fields)
     if not is_allowed:
         raise PermissionError(f"Access denied: field '{denied_field}' not accessible")
@@ -344,7 +601,7 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
     row_filter_spec = perm["rows"]
     if row_filter_spec == "*":
         # "*" means all rows (no filter)
-        row_filter = Q()
+        row_filter = _EMPTY_Q
     elif callable(row_filter_spec):
         # Callable in config - pass user (may be None for anon)
         row_filter = row_filter_spec(user)
@@ -359,7 +616,7 @@ def check_permission(user, model_name, action, requested_fields, permissions=Non
         row_filter = resolver_row_filter
     else:
         # No filter specified anywhere - allow all rows
-        row_filter = Q()
+        row_filter = _EMPTY_Q
 
     return row_filter, requested_fields
 
@@ -414,13 +671,17 @@ def check_filter_permission(user, model_name, filter_keys, permissions=None):
     perm = normalize_role_config(model_perms[role])
 
     # "*" means all filters allowed
-    allowed_filters = perm["filters"]
+    allowed_filters = perm["_filters_set"]
     if allowed_filters == "*":
         return
 
     max_depth = flex_settings.MAX_RELATION_DEPTH
 
     for key in filter_keys:
+        # Non-string keys cannot be granted (and would break the set lookup)
+        if not isinstance(key, str):
+            raise PermissionError(f"Filter denied: {key!r} not allowed for filtering")
+
         # Skip composite operators (or, and, not) - they're handled recursively
         if key in ("or", "and", "not"):
             continue
@@ -485,8 +746,12 @@ def check_order_permission(user, model_name, order_by, permissions=None):
     # Normalize the role config
     perm = normalize_role_config(model_perms[role])
 
+    # Non-string order_by (list, dict, ...) is never a valid ordering
+    if not isinstance(order_by, str):
+        raise PermissionError(f"Order denied: {order_by!r} not allowed for ordering")
+
     # "*" means all order_by allowed
-    allowed_order = perm["order_by"]
+    allowed_order = perm["_order_set"]
     if allowed_order == "*":
         return
 
@@ -19,7 +19,7 @@ from django_flex.permissions import (
     check_filter_permission,
     check_order_permission,
 )
-from django_flex.response import FlexResponse, build_nested_response
+from django_flex.response import FlexResponse, build_nested_response, build_nested_response_batch
 
 
 def get_model_by_name(model_name):
@@ -240,10 +240,8 @@ class FlexQuery:
         # Build results dict keyed by id
         json_fields = set(get_json_fields(self.model))
         fk_fields = get_fk_fields(self.model)
-        results = {}
-        for obj in paginated:
-            obj_data = build_nested_response(obj, validated_fields, json_fields, fk_fields)
-            results[str(obj.pk)] = obj_data
+        rows = build_nested_response_batch(paginated, validated_fields, json_fields, fk_fields)
+        results = {str(obj.pk): obj_data for obj, obj_data in zip(paginated, rows)}
 
         # Build pagination info
         pagination = {
@@ -9,9 +9,30 @@ Features:
 - Response code management
 """
 
+import sys
+from functools import lru_cache
+
+from django_flex import jsonutils
 from django_flex.conf import flex_settings
 
 
+@lru_cache(maxsize=4096)
+def _split_path(field_path):
+    """
+    Split a dot-notation path into a tuple of parts (cached, paths are schema-bounded).
+
+    Parts are interned: they become keys of every response dict, so interning
+    lets later dict lookups and key comparisons short-circuit on identity.
+    """
+    return tuple(sys.intern(part) for part in field_path.split("."))
+
+
+@lru_cache(maxsize=1024)
+def _fk_attname(field_name):
+    """Interned "<field>_id" column attribute for a ForeignKey field (cached)."""
+    return sys.intern(f"{field_name}_id")
+
+
 def get_field_value(obj, field_path, json_fields=None, fk_fields=None):
     """
     Get value from object following dot notation path.
@@ -48,11 +69,11 @@ def get_field_value(obj, field_path, json_fields=None, fk_fields=None):
     if fk_fields is None:
         fk_fields = set()
 
-    parts = field_path.split(".")
+    parts = _split_path(field_path)
 
     # Simple FK field (not nested) - use _id column directly for efficiency
     if len(parts) == 1 and parts[0] in fk_fields:
-        return getattr(obj, f"{parts[0]}_id", None)
+        return getattr(obj, _fk_attname(parts[0]), None)
 
     value = obj
 
@@ -81,6 +102,11 @@ def get_field_value(obj, field_path, json_fields=None, fk_fields=None):
     return value
 
 
+# Types serialize_value returns unchanged. float is not listed: it has .hex()
+# and is therefore stringified by the UUID branch below.
+_PASSTHROUGH_TYPES = frozenset({str, int, bool, dict, list})
+
+
 def serialize_value(value):
     """
     Serialize a value for JSON response.
@@ -99,6 +125,10 @@ def serialize_value(value):
     if value is None:
         return None
 
+    # Plain JSON values - skip the attribute probes (each failed hasattr raises internally)
+    if type(value) in _PASSTHROUGH_TYPES:
+        return value
+
     # DateTime/Date
     if hasattr(value, "isoformat"):
         return value.isoformat()
@@ -114,6 +144,162 @@ def serialize_value(value):
     return value
 
 
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def _compile_paths(field_paths, json_fields, fk_fields):
+    """
+    Compile field paths into a traversal plan shared by every row.
+
+    Each entry is (parents, leaf, hops, json_keys):
+        parents: Output keys leading to the leaf's dict (parts[:-1])
+        leaf: Output key for the value (parts[-1])
+        hops: ((key, attr), ...) attribute lookups, where key is the dotted
+              attribute chain fetched so far. Paths sharing a relation or
+              JSONField prefix share keys, so the prefix is fetched once per row.
+        json_keys: Dict keys to walk inside a JSONField value, or None.
+
+    Args:
+        field_paths: Tuple of dot-notation field paths
+        json_fields: Frozenset of JSONField names
+        fk_fields: Frozenset of ForeignKey field names
+
+    Returns:
+        Tuple of (plan, tree). tree is the plan folded by _build_tree, or None
+        when a requested path is also a parent of another path; such plans can
+        leave a scalar where a nested dict is expected and go through the
+        collision-aware path in build_nested_response instead.
+    """
+    plan = []
+
+    for field_path in field_paths:
+        parts = _split_path(field_path)
+
+        # Simple FK field (not nested) - read the _id column directly
+        if len(parts) == 1 and parts[0] in fk_fields:
+            attr = _fk_attname(parts[0])
+            plan.append(((), parts[0], ((attr, attr),), None))
+            continue
+
+        hops = []
+        json_keys = None
+        for i, part in enumerate(parts):
+            hops.append((sys.intern(".".join(parts[: i + 1])), part))
+            if part in json_fields:
+                # Remaining parts are keys inside the JSONField dict
+                json_keys = parts[i + 1 :]
+                break
+
+        plan.append((parts[:-1], parts[-1], tuple(hops), json_keys))
+
+    # A path that is also another path's parent (e.g. "metadata" + "metadata.level")
+    # can leave a scalar where a nested dict is expected
+    leaves = {parents + (leaf,) for parents, leaf, _, _ in plan}
+    parent_prefixes = {parents[: i + 1] for parents, _, _, _ in plan for i in range(len(parents))}
+    nest_safe = leaves.isdisjoint(parent_prefixes)
+
+    plan = tuple(plan)
+    return plan, (_build_tree(plan) if nest_safe else None)
+
+
+def _build_tree(plan):
+    """
+    Fold a nest-safe plan into a tree mirroring the output dict.
+
+    Each node is (key, name, is_json, children): name is the attribute to read
+    (or the dict key when is_json), children is None for leaves. Sibling order
+    follows first occurrence in the plan, matching the flat build's key order.
+    """
+    root = {}
+
+    for parents, leaf, hops, json_keys in plan:
+        steps = [(attr, False) for _, attr in hops]
+        steps.extend((key, True) for key in json_keys or ())
+
+        level = root
+        path = parents + (leaf,)
+        for depth, (key, (name, is_json)) in enumerate(zip(path, steps)):
+            node = level.get(key)
+            if node is None:
+                node = level[key] = [name, is_json, None]
+            if depth < len(path) - 1:
+                if node[2] is None:
+                    node[2] = {}
+                level = node[2]
+
+    def freeze(level):
+        return tuple(
+            (key, name, is_json, None if children is None else freeze(children))
+            for key, (name, is_json, children) in level.items()
+        )
+
+    return freeze(root)
+
+
+def _build_from_tree(obj, tree):
+    """
+    Build the output dict by walking a compiled tree against obj.
+
+    Each relation is fetched once and handed to its children, so no path is
+    split or re-resolved per row. A missing parent yields None leaves, as
+    get_field_value does. Nested levels are walked with an explicit stack
+    rather than recursion; each nested dict is inserted into its parent
+    before it is filled, so key order matches the requested field order.
+    """
+    result = {}
+    stack = [(result, obj, tree)]
+
+    while stack:
+        out, value, nodes = stack.pop()
+
+        for key, name, is_json, children in nodes:
+            if value is None:
+                child = None
+            elif is_json:
+                child = value.get(name) if isinstance(value, dict) else None
+            else:
+                child = getattr(value, name, None)
+
+            if children is None:
+                out[key] = serialize_value(child)
+            else:
+                nested = out[key] = {}
+                stack.append((nested, child, children))
+
+    return result
+
+
+def _resolve_compiled(obj, hops, json_keys, resolved):
+    """
+    Resolve a compiled path against obj, reusing prefixes already in resolved.
+
+    Same semantics as get_field_value; resolved is a per-row dict of
+    attribute chain -> fetched value.
+    """
+    value = obj
+
+    for key, attr in hops:
+        if value is None:
+            return None
+        cached = resolved.get(key, _MISSING)
+        if cached is _MISSING:
+            cached = resolved[key] = getattr(value, attr, None)
+        value = cached
+
+    if json_keys is not None:
+        if value is None:
+            return None
+        for json_key in json_keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(json_key)
+            if value is None:
+                return None
+
+    return value
+
+
 def build_nested_response(obj, field_paths, json_fields=None, fk_fields=None):
     """
     Build nested dict response from object and field paths.
@@ -144,28 +330,91 @@ def build_nested_response(obj, field_paths, json_fields=None, fk_fields=None):
     if obj is None:
         return None
 
+    plan, tree = _compile_paths(
+        tuple(field_paths), frozenset(json_fields or ()), frozenset(fk_fields or ())
+    )
+
+    if tree is not None:
+        # Fast path: parent keys can only ever hold dicts we created
+        return _build_from_tree(obj, tree)
+
     result = {}
+    # Values fetched for shared relation/JSONField prefixes on this row
+    resolved = {}
 
-    for field_path in field_paths:
-        parts = field_path.split(".")
-        value = get_field_value(obj, field_path, json_fields, fk_fields)
+    for parents, leaf, hops, json_keys in plan:
+        value = _resolve_compiled(obj, hops, json_keys, resolved)
         value = serialize_value(value)
 
         # Build nested structure
         current = result
-        for i, part in enumerate(parts[:-1]):
-            if part not in current:
-                current[part] = {}
+        for part in parents:
+            existing = current.get(part)
+            if existing is None:
+                existing = current[part] = {}
             # Handle case where current[part] is already a non-dict value (from JSONField)
-            elif not isinstance(current[part], dict):
+            elif not isinstance(existing, dict):
                 break
-            current = current[part]
-
-        current[parts[-1]] = value
+            current = existing
+        else:
+            current[leaf] = value
 
     return result
 
 
+def _build_columns(values, nodes):
+    """
+    Build one output level for a whole column of values (batch form of _build_from_tree).
+
+    Each field is read across every row before moving to the next field, and
+    child relations recurse on the fetched column, so per-field dispatch is
+    paid once per field rather than once per row.
+    """
+    rows = [{} for _ in values]
+
+    for key, name, is_json, children in nodes:
+        if is_json:
+            column = [value.get(name) if isinstance(value, dict) else None for value in values]
+        else:
+            column = [None if value is None else getattr(value, name, None) for value in values]
+
+        column = (
+            map(serialize_value, column) if children is None else _build_columns(column, children)
+        )
+
+        for row, value in zip(rows, column):
+            row[key] = value
+
+    return rows
+
+
+def build_nested_response_batch(objs, field_paths, json_fields=None, fk_fields=None):
+    """
+    Build nested dict responses for a list of objects.
+
+    Produces the same output as calling build_nested_response per object,
+    but compiles the field paths once and serializes column by column.
+
+    Args:
+        objs: Sequence of model instances
+        field_paths: List of field paths (e.g., ["id", "customer.name"])
+        json_fields: Optional set of JSONField names for proper JSON traversal
+        fk_fields: Optional set of ForeignKey field names for efficient ID access
+
+    Returns:
+        List of nested dictionaries, one per object (None for None objects)
+    """
+    plan, tree = _compile_paths(
+        tuple(field_paths), frozenset(json_fields or ()), frozenset(fk_fields or ())
+    )
+
+    if tree is None:
+        return [build_nested_response(obj, field_paths, json_fields, fk_fields) for obj in objs]
+
+    rows = _build_columns(objs, tree)
+    return [None if obj is None else row for obj, row in zip(objs, rows)]
+
+
 class FlexResponse:
     """
     Response builder for django-flex queries.
@@ -194,11 +443,15 @@ class FlexResponse:
         "UNAUTHORIZED": 401,
         "PERMISSION_DENIED": 403,
         "NOT_FOUND": 404,
+        "PAYLOAD_TOO_LARGE": 413,
         "RATE_LIMITED": 429,
         "INTERNAL_ERROR": 500,
         "CREATE_FAILED": 400,
     }
 
+    # One instance per request - slots keep construction and attribute reads lean
+    __slots__ = ("_code", "_warning", "_error_message", "_data", "_http_status", "_dicts")
+
     def __init__(self, code="OK", warning=False, error_message=None, **data):
         """
         Initialize a FlexResponse.
@@ -209,20 +462,72 @@ class FlexResponse:
             error_message: Optional error message for error responses
             **data: Additional data to include in response
         """
-        self.code = code
-        self.warning = warning
-        self.error_message = error_message
-        self.data = data
+        self._code = code
+        self._warning = warning
+        self._error_message = error_message
+        self._data = data
+        self._http_status = self.STATUS_MAP.get(code, 500)
+        # Built payloads, indexed by include_status_code (see _cached_dict)
+        self._dicts = [None, None]
+
+    @property
+    def code(self):
+        """Response code key (e.g., "OK", "NOT_FOUND")."""
+        return self._code
+
+    @code.setter
+    def code(self, value):
+        self._code = value
+        self._http_status = self.STATUS_MAP.get(value, 500)
+        self._dicts = [None, None]
+
+    @property
+    def warning(self):
+        """Whether this is a warning response."""
+        return self._warning
+
+    @warning.setter
+    def warning(self, value):
+        self._warning = value
+        self._dicts = [None, None]
+
+    @property
+    def error_message(self):
+        """Error message for error responses (or None)."""
+        return self._error_message
+
+    @error_message.setter
+    def error_message(self, value):
+        self._error_message = value
+        self._dicts = [None, None]
+
+    @property
+    def data(self):
+        """
+        Additional response data.
+
+        The caller may edit the returned dict in place, so handing it out
+        drops any built payloads.
+        """
+        self._dicts = [None, None]
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._dicts = [None, None]
+
+    SUCCESS_CODES = frozenset({"OK", "OK_QUERY", "CREATED", "LIMIT_CLAMPED"})
 
     @property
     def success(self):
         """Whether the response indicates success."""
-        return self.code in ("OK", "OK_QUERY", "CREATED", "LIMIT_CLAMPED")
+        return self._code in self.SUCCESS_CODES
 
     @property
     def http_status(self):
         """Get HTTP status code for this response."""
-        return self.STATUS_MAP.get(self.code, 500)
+        return self._http_status
 
     @classmethod
     def ok(cls, **data):
@@ -259,6 +564,7 @@ class FlexResponse:
         "UNAUTHORIZED": "Authentication required",
         "PERMISSION_DENIED": "Permission denied",
         "NOT_FOUND": "Not found",
+        "PAYLOAD_TOO_LARGE": "Request body too large",
         "RATE_LIMITED": "Rate limit exceeded",
         "INTERNAL_ERROR": "Internal server error",
         "INVALID_FIELD": "Invalid field",
@@ -280,37 +586,72 @@ class FlexResponse:
             - error: Error message (for error responses)
             - warning: Warning message (for warning responses)
             Plus any additional data fields.
+
+        Returns a new dict on every call; editing it never affects the response.
         """
-        result = {}
+        return dict(self._cached_dict(include_status_code))
 
-        if include_status_code:
-            result["status_code"] = self.http_status
-            result["success"] = self.success
+    def _cached_dict(self, include_status_code):
+        """
+        Build the to_dict() payload once per mode (never mutate the result).
 
-            if self.error_message:
-                result["error"] = self.error_message
-            elif not self.success and not self.error_message:
-                result["error"] = self.MSG_MAP.get(self.code, "An error occurred")
+        Reassigning a field, or reading data (which may then be edited in
+        place), drops the cached payloads.
+        """
+        mode = 1 if include_status_code else 0
+        payload = self._dicts[mode]
+        if payload is None:
+            payload = self._to_dict_http200() if mode else self._to_dict_legacy()
+            self._dicts[mode] = payload
+        return payload
 
-            if self.warning:
-                result["warning"] = self.MSG_MAP.get(self.code, "Warning")
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _envelope_template(cls, code, warning, has_error):
+        """
+        Build the ALWAYS_HTTP_200 envelope for a code (cached, never mutate the result).
 
-        else:
-            # Legacy mode (ALWAYS_HTTP_200=False)
-            if self.warning:
-                result["warning"] = True
-                result["warning_code"] = self.code
+        When has_error is set an "error" slot is always present, so a custom
+        error message keeps its position ahead of "warning" when merged in.
+        """
+        success = code in cls.SUCCESS_CODES
+        template = {"status_code": cls.STATUS_MAP.get(code, 500), "success": success}
+
+        default_error = None if success else cls.MSG_MAP.get(code, "An error occurred")
+        if default_error or has_error:
+            template["error"] = default_error
+        if warning:
+            template["warning"] = cls.MSG_MAP.get(code, "Warning")
+        return template
+
+    def _to_dict_http200(self):
+        """Build the ALWAYS_HTTP_200 payload (status_code, success, error/warning, data)."""
+        template = self._envelope_template(self._code, self._warning, bool(self._error_message))
+
+        if self._error_message:
+            return {**template, "error": self._error_message, **self._data}
+        return {**template, **self._data}
+
+    def _to_dict_legacy(self):
+        """Build the legacy payload (ALWAYS_HTTP_200=False): data plus error/warning flags."""
+        result = {}
 
-            if self.error_message:
-                result["error"] = self.error_message
+        if self._warning:
+            result["warning"] = True
+            result["warning_code"] = self._code
 
-        result.update(self.data)
+        if self._error_message:
+            result["error"] = self._error_message
 
+        result.update(self._data)
         return result
 
     def to_json_response(self):
         """
-        Convert to Django JsonResponse.
+        Convert to a Django HttpResponse with a JSON body.
+
+        The body is encoded with jsonutils (orjson when installed), which
+        accepts the same types as JsonResponse.
 
         When ALWAYS_HTTP_200 is True:
         - All responses return HTTP 200
@@ -320,19 +661,89 @@ class FlexResponse:
         When ALWAYS_HTTP_200 is False (default):
         - Uses traditional HTTP status codes
         - No status_code in payload
+
+        The payload dict is attached as ``response.flex_payload`` so tests and
+        middleware can inspect it without decoding the body again.
         """
-        from django.http import JsonResponse
+        from django.http import HttpResponse
         from django.conf import settings
-        from django_flex.conf import flex_settings
 
-        if flex_settings.ALWAYS_HTTP_200:
-            response_dict = self.to_dict(include_status_code=True)
+        always_http_200 = bool(flex_settings.ALWAYS_HTTP_200)
+
+        # Common bare errors have a fixed payload - serve the pre-encoded body. Canned
+        # keys only carry None or the default message, so the lookup itself checks both
+        message = self._error_message
+        if not self._data and not self._warning and (message is None or type(message) is str):
+            canned = _CANNED_ERRORS.get((self._code, always_http_200, message))
+            if canned is not None:
+                body, status, payload = canned
+                response = HttpResponse(body, content_type="application/json", status=status)
+                response.flex_payload = dict(payload)
+                return response
+
+        payload = self._payload(
+            always_http_200, include_exception=always_http_200 and settings.DEBUG
+        )
+        status = 200 if always_http_200 else self.http_status
+        response = HttpResponse(
+            jsonutils.dumps(payload), content_type="application/json", status=status
+        )
+        # Copy so edits to flex_payload never reach the cached payload
+        response.flex_payload = dict(payload)
+        return response
+
+    def to_json_bytes(self, include_status_code=False, include_exception=False):
+        """
+        Build the payload and encode it as JSON bytes in one step.
 
-            # Add exception details in DEBUG mode for internal errors
-            if settings.DEBUG and self.code == "INTERNAL_ERROR" and self.error_message:
-                response_dict["exception"] = self.error_message
+        Args:
+            include_status_code: If True, build the ALWAYS_HTTP_200 payload
+            include_exception: If True, add the error message as "exception"
+                for INTERNAL_ERROR responses (DEBUG mode)
 
-            return JsonResponse(response_dict, status=200)
-        else:
-            # Traditional: use HTTP status codes
-            return JsonResponse(self.to_dict(), status=self.http_status)
+        Returns:
+            Encoded JSON as bytes
+        """
+        return jsonutils.dumps(self._payload(include_status_code, include_exception))
+
+    def _payload(self, include_status_code, include_exception):
+        """Build the response dict for to_json_bytes / to_json_response."""
+        payload = self._cached_dict(include_status_code)
+        exposes_exception = include_exception and self._code == "INTERNAL_ERROR"
+        if include_status_code and exposes_exception and self._error_message:
+            # Copy so the cached payload stays exception-free
+            payload = {**payload, "exception": self._error_message}
+        return payload
+
+
+# Error codes whose bare payloads are pre-encoded at import time
+_CANNED_ERROR_CODES = (
+    "BAD_REQUEST",
+    "UNAUTHORIZED",
+    "PERMISSION_DENIED",
+    "NOT_FOUND",
+    "RATE_LIMITED",
+)
+
+
+def _build_canned_errors():
+    """
+    Pre-encode bare error payloads for both ALWAYS_HTTP_200 modes.
+
+    Keyed by (code, always_http_200, error_message) where error_message is
+    None or the default MSG_MAP message. Values are (body, status, payload);
+    bodies are byte-identical to what the uncanned to_json_response path
+    produces for the same dict.
+    """
+    canned = {}
+    for code in _CANNED_ERROR_CODES:
+        for message in (None, FlexResponse.MSG_MAP[code]):
+            response = FlexResponse.error(code, message)
+            http200 = response._to_dict_http200()
+            legacy = response._to_dict_legacy()
+            canned[(code, True, message)] = (jsonutils.dumps(http200), 200, http200)
+            canned[(code, False, message)] = (jsonutils.dumps(legacy), response.http_status, legacy)
+    return canned
+
+
+_CANNED_ERRORS = _build_canned_errors()
@@ -4,6 +4,10 @@ Pytest configuration for django-flex tests.
 
 import os
 import sys
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
 
 # Add the package root to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -41,3 +45,130 @@ def pytest_configure():
     import django
 
     django.setup()
+
+
+@pytest.fixture
+def make_model_mock():
+    """
+    Factory for a mock model whose objects.all().get() returns a mock instance.
+
+    Uses plain Mock (not MagicMock) - magic-method wiring is not needed here.
+
+    Usage:
+        mock_model, mock_obj = make_model_mock()
+        mock_model, _ = make_model_mock(missing=True)  # get() raises DoesNotExist
+    """
+
+    def _make(obj_pk=1, missing=False):
+        mock_model = Mock()
+        mock_model.DoesNotExist = type("DoesNotExist", (Exception,), {})
+        mock_model._meta.get_fields.return_value = []
+        mock_obj = Mock(pk=obj_pk)
+        if missing:
+            mock_model.objects.all.return_value.get.side_effect = mock_model.DoesNotExist()
+        else:
+            mock_model.objects.all.return_value.get.return_value = mock_obj
+        return mock_model, mock_obj
+
+    return _make
+
+
+@pytest.fixture
+def query_with_perm(make_model_mock):
+    """
+    Factory for a FlexQuery bound to a mock model with permission checks stubbed out.
+
+    Usage:
+        query, mock_model, mock_obj = query_with_perm()
+        query, _, _ = query_with_perm(allowed=("id", "name"))
+    """
+    from django_flex.query import FlexQuery
+
+    def _make(allowed=("*",), **model_kwargs):
+        mock_model, mock_obj = make_model_mock(**model_kwargs)
+        query = FlexQuery("testmodel")
+        query.model = mock_model
+        query.model_name = "testmodel"
+        query._check_action_permission = lambda *args, **kwargs: None
+        query._get_allowed_fields = lambda *args, **kwargs: list(allowed)
+        return query, mock_model, mock_obj
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def setup_db(django_db_setup, django_db_blocker):
+    """Shared DB setup for the security case runners (no fixtures needed yet)."""
+    pass
+
+
+@pytest.fixture
+def flex_state():
+    """
+    Fresh state dict for security test cases ("!var" injection and captures).
+
+    Function-scoped so cases never see each other's captures.
+    """
+    return {
+        "token": "test-token-12345",
+        "user_id": 1,
+        "csrf_token": None,
+        "test_model": "user",
+    }
+
+
+@pytest.fixture(scope="session")
+def request_factory():
+    """Shared RequestFactory; requests it builds are independent, so one instance is enough."""
+    from django.test import RequestFactory
+
+    return RequestFactory()
+
+
+@pytest.fixture(scope="session")
+def _shared_anon_authenticated_user():
+    """Session-wide user object behind anon_authenticated_user."""
+    user = Mock(pk=123, is_authenticated=True, is_superuser=False, is_staff=False)
+    user.groups.first.return_value = None
+    return user
+
+
+@pytest.fixture
+def anon_authenticated_user(_shared_anon_authenticated_user):
+    """
+    Shared read-only authenticated, non-staff user with no groups.
+
+    Session-scoped: only use it in tests that read the user, never mutate it.
+    Roles memoized on it by get_user_role are cleared after each test.
+    """
+    from django_flex.permissions import clear_user_role_cache
+
+    yield _shared_anon_authenticated_user
+    clear_user_role_cache(_shared_anon_authenticated_user)
+
+
+class _SettingsStub(SimpleNamespace):
+    """Plain-attribute settings stand-in; unset names fall back to the real flex_settings."""
+
+    def __getattr__(self, name):
+        from django_flex.conf import flex_settings
+
+        return getattr(flex_settings, name)
+
+
+@pytest.fixture
+def stub_permission_settings(monkeypatch):
+    """
+    Swap django_flex.permissions.flex_settings for a plain stub for the rest of the test.
+
+    Usage:
+        stub_permission_settings(ROLE_RESOLVER=resolver, MAX_RELATION_DEPTH=2)
+    """
+    import django_flex.permissions as permissions_module
+
+    def _stub(**attrs):
+        stub = _SettingsStub(**attrs)
+        monkeypatch.setattr(permissions_module, "flex_settings", stub)
+        return stub
+
+    return _stub
@@ -0,0 +1,82 @@
+"""
+Tests for django_flex.conf module.
+"""
+
+from django_flex.conf import DEFAULTS, FlexSettings
+
+
+class TestReload:
+    """Tests for FlexSettings.reload."""
+
+    def test_unchanged_settings_keep_snapshot(self, settings):
+        settings.DJANGO_FLEX = {"DEFAULT_LIMIT": 10}
+        flex = FlexSettings(DEFAULTS)
+        assert flex.DEFAULT_LIMIT == 10
+
+        flex.reload()
+
+        assert "DEFAULT_LIMIT" in vars(flex)
+
+    def test_replaced_settings_are_reloaded(self, settings):
+        settings.DJANGO_FLEX = {"DEFAULT_LIMIT": 10}
+        flex = FlexSettings(DEFAULTS)
+        assert flex.DEFAULT_LIMIT == 10
+
+        settings.DJANGO_FLEX = {"DEFAULT_LIMIT": 20}
+        flex.reload()
+
+        assert flex.DEFAULT_LIMIT == 20
+
+    def test_in_place_edit_is_reloaded(self, settings):
+        settings.DJANGO_FLEX = {"DEFAULT_LIMIT": 10}
+        flex = FlexSettings(DEFAULTS)
+        assert flex.DEFAULT_LIMIT == 10
+
+        settings.DJANGO_FLEX["DEFAULT_LIMIT"] = 30
+        flex.reload()
+
+        assert flex.DEFAULT_LIMIT == 30
+
+    def test_nested_in_place_edit_is_reloaded(self, settings):
+        settings.DJANGO_FLEX = {"PERMISSIONS": {"booking": {"staff": {"ops": ["get"]}}}}
+        flex = FlexSettings(DEFAULTS)
+        assert flex.PERMISSIONS["booking"]["staff"]["ops"] == ["get"]
+
+        settings.DJANGO_FLEX["PERMISSIONS"]["booking"] = {"staff": {"ops": ["list"]}}
+        flex.reload()
+
+        assert "PERMISSIONS" not in vars(flex)
+
+    def test_permission_caches_cleared(self, settings):
+        from django_flex.permissions import _NORMALIZED_ROLE_CONFIGS, _PERMISSION_INDEXES, permission_index
+
+        settings.DJANGO_FLEX = {}
+        flex = FlexSettings(DEFAULTS)
+        flex.DEFAULT_LIMIT
+        permission_index({"booking": {"staff": {"ops": ["get"]}}})
+
+        flex.reload()
+
+        assert not _NORMALIZED_ROLE_CONFIGS
+        assert not _PERMISSION_INDEXES
+
+    def test_uncopyable_setting_value(self, settings):
+        import threading
+
+        class Resolver:
+            def __init__(self):
+                self.lock = threading.Lock()
+
+            def resolve(self, user, model_name):
+                return "staff"
+
+        resolve = Resolver().resolve
+        settings.DJANGO_FLEX = {"ROLE_RESOLVER": resolve, "PERMISSIONS": {"booking": {"staff": "*"}}}
+        flex = FlexSettings(DEFAULTS)
+
+        assert flex.ROLE_RESOLVER == resolve
+
+        flex.reload()
+
+        # Leaf values are kept by reference, so the unchanged settings stay loaded
+        assert "ROLE_RESOLVER" in vars(flex)
@@ -8,6 +8,9 @@ from django_flex.fields import get_json_fields, is_json_field_path
 from django_flex.filters import parse_filter_key
 from django_flex.response import get_field_value, build_nested_response
 
+# DB-backed: keep on a single worker when run with `pytest -n auto --dist=loadgroup`
+pytestmark = pytest.mark.xdist_group("db")
+
 
 class TestGetJsonFields:
     """Tests for get_json_fields function."""
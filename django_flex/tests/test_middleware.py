@@ -78,6 +78,7 @@ class TestResolveUserFromToken:
 
     def test_invalid_token_leaves_user_unchanged(self):
         """Invalid token should not modify request.user."""
+        from django.core.exceptions import ObjectDoesNotExist
         from django_flex.middleware import FlexQueryMiddleware
 
         middleware = FlexQueryMiddleware(lambda r: r)
@@ -89,7 +90,7 @@ class TestResolveUserFromToken:
         body = {"__token": "invalid_token"}
 
         with patch("app.models.Session") as mock_session:
-            mock_session.objects.select_related.return_value.get.side_effect = Exception("Not found")
+            mock_session.objects.select_related.return_value.get.side_effect = ObjectDoesNotExist("Not found")
 
             middleware._resolve_user_from_token(request, body)
 
@@ -125,6 +126,184 @@ class TestResolveUserFromToken:
         middleware._resolve_user_from_token(request, None)
 
 
+class TestMalformedTokenRejection:
+    """Tests that malformed tokens are rejected before any session lookup."""
+
+    @pytest.mark.parametrize(
+        "token",
+        ["x" * 1000, "bad token", "token'; DROP TABLE session;--", {"$ne": None}, 12345],
+    )
+    def test_malformed_token_skips_session_lookup(self, settings, token):
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware
+
+        settings.DJANGO_FLEX = {"SESSION_MODEL": "app.models.Session"}
+        flex_settings.reload()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        request = MagicMock()
+        request.headers = {}
+        original_user = request.user
+
+        with patch("django.apps.apps.get_model") as mock_get_model:
+            middleware._resolve_user_from_token(request, {"__token": token})
+
+        mock_get_model.assert_not_called()
+        assert request.user == original_user
+
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+
+class TestSessionUserProjection:
+    """Tests for SESSION_USER_ONLY_FIELDS column projection."""
+
+    def test_only_projects_configured_user_fields(self, settings):
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware, _get_session_model
+
+        settings.DJANGO_FLEX = {
+            "SESSION_MODEL": "app.models.Session",
+            "SESSION_USER_ONLY_FIELDS": ["id", "is_active"],
+        }
+        flex_settings.reload()
+        _get_session_model.cache_clear()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        request = MagicMock()
+        request.headers = {"Authorization": "Bearer projected_token"}
+
+        mock_model = MagicMock()
+        with patch("django.apps.apps.get_model", return_value=mock_model):
+            middleware._resolve_user_from_token(request, {})
+
+        mock_model.objects.select_related.return_value.only.assert_called_once_with(
+            "token", "user", "user__id", "user__is_active"
+        )
+
+        _get_session_model.cache_clear()
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+
+    def test_unknown_user_field_leaves_user_unchanged(self, settings):
+        """A typo in SESSION_USER_ONLY_FIELDS is logged, not turned into a 500."""
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware, _get_session_model
+
+        # Any real FK works as the session -> user relation here
+        settings.DJANGO_FLEX = {
+            "SESSION_MODEL": "auth.Permission",
+            "SESSION_TOKEN_FIELD": "codename",
+            "SESSION_USER_FIELD": "content_type",
+            "SESSION_USER_ONLY_FIELDS": ["bogus"],
+        }
+        flex_settings.reload()
+        _get_session_model.cache_clear()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        request = MagicMock()
+        request.headers = {"Authorization": "Bearer projected_token"}
+        original_user = request.user
+
+        middleware._resolve_user_from_token(request, {})
+
+        assert request.user == original_user
+
+        _get_session_model.cache_clear()
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+
+class TestSessionTokenCache:
+    """Tests for SESSION_CACHE_TIMEOUT token -> user caching."""
+
+    @pytest.fixture
+    def session_model(self, settings):
+        from django.core.exceptions import ObjectDoesNotExist
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import _get_session_model, invalidate_token_cache
+
+        settings.DJANGO_FLEX = {"SESSION_MODEL": "app.models.Session", "SESSION_CACHE_TIMEOUT": 60}
+        flex_settings.reload()
+        invalidate_token_cache()
+        _get_session_model.cache_clear()
+
+        mock_model = MagicMock()
+        mock_model.DoesNotExist = ObjectDoesNotExist
+        with patch("django.apps.apps.get_model", return_value=mock_model):
+            yield mock_model
+
+        invalidate_token_cache()
+        _get_session_model.cache_clear()
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+    def _request(self, token):
+        request = MagicMock()
+        request.headers = {"Authorization": f"Bearer {token}"}
+        return request
+
+    def test_repeated_token_skips_session_query(self, session_model):
+        """A cached token should resolve the user without querying again."""
+        from django_flex.middleware import FlexQueryMiddleware
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        mock_user = MagicMock()
+        session_model.objects.select_related.return_value.get.return_value = MagicMock(user=mock_user)
+
+        first, second = self._request("cached_token_abc"), self._request("cached_token_abc")
+        middleware._resolve_user_from_token(first, {})
+        middleware._resolve_user_from_token(second, {})
+
+        assert first.user == mock_user
+        assert second.user == mock_user
+        assert session_model.objects.select_related.return_value.get.call_count == 1
+
+    def test_invalid_token_is_negatively_cached(self, session_model):
+        """Unknown tokens should not hit the database on every request."""
+        from django.core.exceptions import ObjectDoesNotExist
+        from django_flex.middleware import FlexQueryMiddleware
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        session_model.objects.select_related.return_value.get.side_effect = ObjectDoesNotExist
+
+        for _ in range(3):
+            request = self._request("unknown_token_xyz")
+            original_user = request.user
+            middleware._resolve_user_from_token(request, {})
+            assert request.user == original_user
+
+        assert session_model.objects.select_related.return_value.get.call_count == 1
+
+    def test_duplicate_token_leaves_user_unchanged(self, session_model):
+        """A token matching several sessions is an auth error, not a crash."""
+        from django.core.exceptions import MultipleObjectsReturned
+        from django_flex.middleware import FlexQueryMiddleware
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        session_model.objects.select_related.return_value.get.side_effect = MultipleObjectsReturned
+
+        request = self._request("duplicate_token_abc")
+        original_user = request.user
+        middleware._resolve_user_from_token(request, {})
+
+        assert request.user == original_user
+
+    def test_invalidate_forces_fresh_lookup(self, session_model):
+        """invalidate_token_cache() should drop the cached user (e.g., on logout)."""
+        from django_flex.middleware import FlexQueryMiddleware, invalidate_token_cache
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        session_model.objects.select_related.return_value.get.return_value = MagicMock()
+
+        middleware._resolve_user_from_token(self._request("logout_token_123"), {})
+        invalidate_token_cache("logout_token_123")
+        middleware._resolve_user_from_token(self._request("logout_token_123"), {})
+
+        assert session_model.objects.select_related.return_value.get.call_count == 2
+
+
 class TestHandleFlexQueryTokenFlow:
     """Tests for full handle_flex_query flow with __token."""
 
@@ -169,6 +348,105 @@ class TestHandleFlexQueryTokenFlow:
                     assert "__token" in call_args[0][1]
 
 
+class TestUnauthenticatedFastReject:
+    """Requests that cannot authenticate are rejected before the body is parsed."""
+
+    def _request(self, body):
+        request = MagicMock()
+        request.method = "POST"
+        request.path = "/api/"
+        request.headers = {}
+        request.user.is_authenticated = False
+        request.body = body
+        return request
+
+    def test_no_token_rejected_without_parsing(self, settings):
+        """Invalid JSON is never parsed when there is no way to authenticate."""
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware
+
+        settings.DJANGO_FLEX = {"REQUIRE_AUTHENTICATION": True, "SESSION_MODEL": "app.models.Session"}
+        flex_settings.reload()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        response = middleware.handle_flex_query(self._request(b"{not json"))
+
+        # PERMISSION_DENIED rather than the invalid-JSON error
+        assert response.status_code == 403
+
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+    def test_body_token_still_parsed(self, settings):
+        """A body carrying __token goes through full parsing and token resolution."""
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware
+
+        settings.DJANGO_FLEX = {"REQUIRE_AUTHENTICATION": True, "SESSION_MODEL": "app.models.Session"}
+        flex_settings.reload()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        request = self._request(json.dumps({"_model": "user", "__token": "abc"}).encode())
+
+        with patch.object(middleware, "_resolve_user_from_token") as mock_resolve:
+            middleware.handle_flex_query(request)
+
+        mock_resolve.assert_called_once()
+        assert mock_resolve.call_args[0][1]["__token"] == "abc"
+
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+
+class TestMaxBodyBytes:
+    """Tests for MAX_BODY_BYTES request body limit."""
+
+    def _request(self, body, content_length=None):
+        request = MagicMock()
+        request.method = "POST"
+        request.path = "/api/"
+        request.headers = {}
+        request.META = {"CONTENT_LENGTH": str(content_length if content_length is not None else len(body))}
+        request.body = body
+        return request
+
+    def test_oversize_body_rejected(self, settings):
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware
+
+        settings.DJANGO_FLEX = {"MAX_BODY_BYTES": 64}
+        flex_settings.reload()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        body = json.dumps({"_model": "user", "padding": "x" * 100}).encode()
+
+        with patch.object(middleware, "_handle_flex_query_internal") as mock_internal:
+            response = middleware.handle_flex_query(self._request(body))
+
+        assert response.status_code == 413
+        mock_internal.assert_not_called()
+
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+    def test_content_length_checked_before_reading_body(self, settings):
+        from django_flex.conf import flex_settings
+        from django_flex.middleware import FlexQueryMiddleware
+
+        settings.DJANGO_FLEX = {"MAX_BODY_BYTES": 64}
+        flex_settings.reload()
+
+        middleware = FlexQueryMiddleware(lambda r: r)
+        request = self._request(b"", content_length=10_000)
+        type(request).body = property(lambda self: pytest.fail("body should not be read"))
+
+        response = middleware.handle_flex_query(request)
+        assert response.status_code == 413
+
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+
 class TestAlwaysHttp200AuthErrors:
     """Tests that auth errors respect ALWAYS_HTTP_200 setting."""
 
@@ -196,9 +474,11 @@ class TestAlwaysHttp200AuthErrors:
             }
         ).encode()
 
+        from django.core.exceptions import ObjectDoesNotExist
+
         # Mock the session lookup to fail (invalid token)
         with patch("app.models.Session") as mock_session:
-            mock_session.objects.select_related.return_value.get.side_effect = Exception("Not found")
+            mock_session.objects.select_related.return_value.get.side_effect = ObjectDoesNotExist("Not found")
 
             response = middleware.handle_flex_query(request)
 
@@ -235,8 +515,10 @@ class TestAlwaysHttp200AuthErrors:
             }
         ).encode()
 
+        from django.core.exceptions import ObjectDoesNotExist
+
         with patch("app.models.Session") as mock_session:
-            mock_session.objects.select_related.return_value.get.side_effect = Exception("Not found")
+            mock_session.objects.select_related.return_value.get.side_effect = ObjectDoesNotExist("Not found")
 
             response = middleware.handle_flex_query(request)
 
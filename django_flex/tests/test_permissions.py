@@ -43,6 +43,14 @@ class TestFieldMatchesPattern:
 
         assert field_matches_pattern("customer.address.city", "customer.address.*") is True
 
+    def test_relation_wildcard_requires_segment_boundary(self):
+        """customer.address.* must not match a sibling sharing the prefix, or the relation itself."""
+        from django_flex.permissions import field_matches_pattern
+
+        assert field_matches_pattern("customer.addressbook.city", "customer.address.*") is False
+        assert field_matches_pattern("customer.address", "customer.address.*") is False
+        assert field_matches_pattern("customers.name", "customer.*") is False
+
 
 class TestFieldsAllowed:
     """Tests for fields_allowed function."""
@@ -95,6 +103,42 @@ class TestFieldsAllowed:
         assert allowed is True
 
 
+class TestFieldMatcher:
+    """Tests for the compiled FieldMatcher used by fields_allowed."""
+
+    FIELDS = ["id", "name", "customer.name", "customer.address.city", "address.city", "owner.email"]
+    PATTERN_SETS = [
+        ["*"],
+        ["customer.*"],
+        ["customer.address.*"],
+        ["id", "owner.email"],
+        ["*", "customer.*", "owner.email"],
+        [],
+    ]
+
+    @pytest.mark.parametrize("patterns", PATTERN_SETS)
+    def test_matches_same_as_field_matches_pattern(self, patterns):
+        from django_flex.permissions import FieldMatcher, field_matches_pattern
+
+        matcher = FieldMatcher(patterns)
+        for field in self.FIELDS:
+            expected = any(field_matches_pattern(field, pattern) for pattern in patterns)
+            assert matcher.allows(field) is expected, (field, patterns)
+
+    def test_empty_matcher_is_falsy(self):
+        from django_flex.permissions import FieldMatcher
+
+        assert not FieldMatcher([])
+        assert FieldMatcher(["id"])
+
+    def test_normalize_role_config_includes_matcher(self):
+        from django_flex.permissions import FieldMatcher, normalize_role_config
+
+        perm = normalize_role_config({"fields": ["id", "customer.*"], "ops": ["get"]})
+        assert isinstance(perm["_fields_matcher"], FieldMatcher)
+        assert perm["_fields_matcher"].allows("customer.name")
+
+
 class TestNormalizeRoleConfig:
     """Tests for normalize_role_config function."""
 
@@ -127,3 +171,133 @@ class TestNormalizeRoleConfig:
         assert perm["filters"] == []  # Default to empty
         assert perm["order_by"] == []  # Default to empty
         assert perm["ops"] == ["get"]
+
+    def test_filters_and_order_by_compiled_to_sets(self):
+        from django_flex.permissions import normalize_role_config
+
+        perm = normalize_role_config({"filters": ["id", "status.in"], "order_by": ["-id"], "ops": ["list"]})
+        assert perm["_filters_set"] == frozenset({"id", "status.in"})
+        assert perm["_order_set"] == frozenset({"-id"})
+        assert normalize_role_config("*")["_filters_set"] == "*"
+        assert normalize_role_config("*")["_order_set"] == "*"
+
+    def test_normalization_cached_per_config_object(self):
+        from django_flex.permissions import normalize_role_config
+
+        config = {"fields": ["id"], "ops": ["get"]}
+        assert normalize_role_config(config) is normalize_role_config(config)
+
+        # An equal but distinct config object is normalized on its own
+        other = {"fields": ["id", "name"], "ops": ["get"]}
+        assert normalize_role_config(other)["fields"] == ["id", "name"]
+
+
+class TestPermissionIndex:
+    """Tests for the flat (model, role, action) grant index used by check_permission."""
+
+    PERMISSIONS = {
+        "booking": {
+            "rate_limit": 10,
+            "staff": {"fields": ["id"], "ops": ["get", "list"]},
+            "superuser": "*",
+            "blocked": {},
+        }
+    }
+
+    def test_index_has_one_entry_per_granted_action(self):
+        from django_flex.permissions import permission_index
+
+        index = permission_index(self.PERMISSIONS)
+
+        assert set(index) == {
+            ("booking", "staff", "get"),
+            ("booking", "staff", "list"),
+            *(("booking", "superuser", op) for op in ("get", "list", "add", "edit", "delete")),
+        }
+        assert index[("booking", "superuser", "get")][1] is True
+        assert permission_index(self.PERMISSIONS) is index
+
+    def test_ungranted_action_reports_operation(self):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_permission
+
+        user = Mock(is_authenticated=True, is_superuser=False, is_staff=True)
+
+        with pytest.raises(PermissionError, match="operation 'delete' not allowed"):
+            check_permission(user, "booking", "delete", ["id"], self.PERMISSIONS)
+
+    def test_superuser_star_bypasses_unindexed_action(self):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_permission
+
+        user = Mock(is_authenticated=True, is_superuser=True)
+
+        row_filter, fields = check_permission(user, "booking", "export", ["id"], self.PERMISSIONS)
+
+        assert fields == ["id"]
+
+    def test_unfiltered_rows_share_one_empty_q(self):
+        from unittest.mock import Mock
+
+        from django.db.models import Q
+
+        from django_flex.permissions import check_permission
+
+        user = Mock(is_authenticated=True, is_superuser=True)
+
+        first, _ = check_permission(user, "booking", "get", ["id"], self.PERMISSIONS)
+        second, _ = check_permission(user, "booking", "list", ["id"], self.PERMISSIONS)
+
+        assert first is second
+        # Combining builds a new Q and leaves the shared one empty
+        assert str(first & Q(pk=1)) == str(Q(pk=1))
+        assert str(first) == str(Q())
+
+    def test_superuser_star_skips_filter_and_order_checks(self):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_filter_permission, check_order_permission
+
+        user = Mock(is_authenticated=True, is_superuser=True)
+
+        # "*" config grants every filter and ordering without per-key checks
+        check_filter_permission(user, "booking", ["anything.icontains"], self.PERMISSIONS)
+        check_order_permission(user, "booking", "-anything", self.PERMISSIONS)
+
+    @pytest.mark.parametrize("order_by", [["id"], {"id": 1}, 1])
+    def test_non_string_order_by_denied(self, order_by):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_order_permission
+
+        user = Mock(is_authenticated=True, is_superuser=True)
+
+        # Rejected even under a "*" config, before any set lookup
+        with pytest.raises(PermissionError, match="Order denied"):
+            check_order_permission(user, "booking", order_by, self.PERMISSIONS)
+
+    def test_non_string_filter_key_and_action_denied(self):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_filter_permission, check_permission
+
+        user = Mock(is_authenticated=True, is_superuser=False, is_staff=True)
+        permissions = {"booking": {"staff": {"fields": ["id"], "ops": ["list"], "filters": ["id"]}}}
+
+        with pytest.raises(PermissionError, match="Filter denied"):
+            check_filter_permission(user, "booking", [("id",)], permissions)
+        with pytest.raises(PermissionError, match="invalid operation"):
+            check_permission(user, "booking", ["list"], ["id"], permissions)
+
+    def test_superuser_without_star_config_is_checked(self):
+        from unittest.mock import Mock
+
+        from django_flex.permissions import check_permission
+
+        user = Mock(is_authenticated=True, is_superuser=True)
+        permissions = {"booking": {"superuser": {"fields": ["id"], "ops": ["get"]}}}
+
+        with pytest.raises(PermissionError, match="field 'secret' not accessible"):
+            check_permission(user, "booking", "get", ["secret"], permissions)
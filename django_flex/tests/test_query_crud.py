@@ -6,17 +6,32 @@ and their helper functions.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, PropertyMock
+from django.db import models
 from django.db.models import Q
 
+from django_flex.fields import get_fk_fields, resolve_fk_values
+from django_flex.query import FlexQuery
+from django_flex.response import get_field_value
+
+
+class _FKStub(models.ForeignKey):
+    """Bare ForeignKey instance for isinstance checks; skips Field.__init__ and mock spec walking."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _fk(name):
+    return _FKStub(name)
+
 
 class TestCheckActionPermission:
     """Tests for _check_action_permission helper method."""
 
     def test_returns_row_filter_on_success(self):
         """Should return row_filter when permission check passes."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         user = MagicMock()
@@ -32,8 +47,6 @@ class TestCheckActionPermission:
 
     def test_returns_none_when_no_user(self):
         """Should return None when user is None."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
@@ -43,8 +56,6 @@ class TestCheckActionPermission:
 
     def test_raises_permission_error_on_failure(self):
         """Should raise PermissionError when check fails."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         user = MagicMock()
@@ -60,15 +71,9 @@ class TestCheckActionPermission:
 class TestGetObjectById:
     """Tests for _get_object_by_id helper method."""
 
-    def test_returns_object_when_found(self):
+    def test_returns_object_when_found(self, make_model_mock):
         """Should return (obj, None) when object is found."""
-        from django_flex.query import FlexQuery
-
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 1
-        mock_model.objects.all.return_value.get.return_value = mock_obj
-        mock_model.DoesNotExist = Exception
+        mock_model, mock_obj = make_model_mock()
 
         query = FlexQuery("testmodel")
         query.model = mock_model
@@ -80,8 +85,6 @@ class TestGetObjectById:
 
     def test_returns_error_when_no_id(self):
         """Should return error when id not in query_spec."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
@@ -91,13 +94,9 @@ class TestGetObjectById:
         assert error is not None
         assert "id" in str(error.to_dict())
 
-    def test_returns_not_found_when_object_missing(self):
+    def test_returns_not_found_when_object_missing(self, make_model_mock):
         """Should return NOT_FOUND error when object doesn't exist."""
-        from django_flex.query import FlexQuery
-
-        mock_model = MagicMock()
-        mock_model.DoesNotExist = Exception
-        mock_model.objects.all.return_value.get.side_effect = mock_model.DoesNotExist()
+        mock_model, _ = make_model_mock(missing=True)
 
         query = FlexQuery("testmodel")
         query.model = mock_model
@@ -109,8 +108,6 @@ class TestGetObjectById:
 
     def test_applies_row_filter(self):
         """Should apply row_filter to queryset when provided."""
-        from django_flex.query import FlexQuery
-
         mock_model = MagicMock()
         mock_obj = MagicMock()
         mock_queryset = MagicMock()
@@ -126,8 +123,10 @@ class TestGetObjectById:
         row_filter = Q(owner_id=5)
         obj, error = query._get_object_by_id({"id": 1}, row_filter)
 
-        mock_queryset.filter.assert_called_once_with(row_filter)
-        mock_filtered.get.assert_called_once_with(pk=1)
+        assert mock_queryset.filter.call_count == 1
+        assert mock_queryset.filter.call_args.args == (row_filter,)
+        assert mock_filtered.get.call_count == 1
+        assert mock_filtered.get.call_args.kwargs == {"pk": 1}
 
 
 class TestGetAllowedFields:
@@ -135,8 +134,6 @@ class TestGetAllowedFields:
 
     def test_returns_star_when_no_permissions(self):
         """Should return ['*'] when no permissions configured."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
@@ -144,19 +141,11 @@ class TestGetAllowedFields:
 
         assert result == ["*"]
 
-    def test_returns_configured_fields(self):
+    def test_returns_configured_fields(self, anon_authenticated_user):
         """Should return configured fields for user's role."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
-        user = MagicMock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
-        user.groups.first.return_value = None
-
         permissions = {
             "testmodel": {
                 "authenticated": {
@@ -166,7 +155,7 @@ class TestGetAllowedFields:
             }
         }
 
-        result = query._get_allowed_fields(user, permissions)
+        result = query._get_allowed_fields(anon_authenticated_user, permissions)
 
         assert result == ["id", "name", "email"]
 
@@ -174,25 +163,11 @@ class TestGetAllowedFields:
 class TestExecuteEdit:
     """Tests for _execute_edit method."""
 
-    def test_edit_success(self):
+    def test_edit_success(self, query_with_perm):
         """Should successfully update object fields."""
-        from django_flex.query import FlexQuery
-
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 1
-        mock_model.objects.all.return_value.get.return_value = mock_obj
-        mock_model.DoesNotExist = Exception
-
-        query = FlexQuery("testmodel")
-        query.model = mock_model
-        query.model_name = "testmodel"
-
-        query_spec = {"id": 1, "name": "Updated Name"}
+        query, _, mock_obj = query_with_perm()
 
-        with patch.object(query, "_check_action_permission", return_value=None):
-            with patch.object(query, "_get_allowed_fields", return_value=["*"]):
-                result = query._execute_edit(query_spec, MagicMock(), {})
+        result = query._execute_edit({"id": 1, "name": "Updated Name"}, MagicMock(), {})
 
         assert result.success
         assert result.data.get("updated") is True
@@ -200,8 +175,6 @@ class TestExecuteEdit:
 
     def test_edit_without_id_fails(self):
         """Should return error when id not provided."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         query.model_name = "testmodel"
@@ -212,51 +185,22 @@ class TestExecuteEdit:
         assert not result.success
         assert "id" in str(result.to_dict())
 
-    def test_edit_disallowed_field_fails(self):
+    def test_edit_disallowed_field_fails(self, query_with_perm):
         """Should return PERMISSION_DENIED for disallowed field."""
-        from django_flex.query import FlexQuery
+        query, _, _ = query_with_perm(allowed=("id", "name"))
 
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 1
-        mock_model.objects.all.return_value.get.return_value = mock_obj
-        mock_model.DoesNotExist = Exception
-
-        query = FlexQuery("testmodel")
-        query.model = mock_model
-        query.model_name = "testmodel"
-
-        query_spec = {"id": 1, "secret_field": "hacked"}
-
-        with patch.object(query, "_check_action_permission", return_value=None):
-            with patch.object(query, "_get_allowed_fields", return_value=["id", "name"]):
-                result = query._execute_edit(query_spec, MagicMock(), {})
+        result = query._execute_edit({"id": 1, "secret_field": "hacked"}, MagicMock(), {})
 
         assert not result.success
         assert "not editable" in str(result.to_dict())
 
-    def test_edit_nonexistent_field_fails(self):
+    def test_edit_nonexistent_field_fails(self, query_with_perm):
         """Should return INVALID_FIELD for nonexistent field."""
-        from django_flex.query import FlexQuery
-
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 1
-        # hasattr will return False for nonexistent field
+        query, _, mock_obj = query_with_perm()
+        # Deleting the attribute makes the mock raise AttributeError, so hasattr() is False
         del mock_obj.nonexistent_field
-        mock_model.objects.all.return_value.get.return_value = mock_obj
-        mock_model.DoesNotExist = Exception
-
-        query = FlexQuery("testmodel")
-        query.model = mock_model
-        query.model_name = "testmodel"
 
-        query_spec = {"id": 1, "nonexistent_field": "value"}
-
-        with patch.object(query, "_check_action_permission", return_value=None):
-            with patch.object(query, "_get_allowed_fields", return_value=["*"]):
-                with patch("builtins.hasattr", return_value=False):
-                    result = query._execute_edit(query_spec, MagicMock(), {})
+        result = query._execute_edit({"id": 1, "nonexistent_field": "value"}, MagicMock(), {})
 
         assert not result.success
         assert "does not exist" in str(result.to_dict())
@@ -267,8 +211,6 @@ class TestExecuteAdd:
 
     def test_add_success(self):
         """Should successfully create object."""
-        from django_flex.query import FlexQuery
-
         mock_model = MagicMock()
         mock_obj = MagicMock()
         mock_obj.pk = 42
@@ -286,12 +228,11 @@ class TestExecuteAdd:
         assert result.success
         assert result.code == "CREATED"
         assert result.data.get("id") == 42
-        mock_model.objects.create.assert_called_once_with(name="New Item", status="active")
+        assert mock_model.objects.create.call_count == 1
+        assert mock_model.objects.create.call_args.kwargs == {"name": "New Item", "status": "active"}
 
     def test_add_permission_denied(self):
         """Should return PERMISSION_DENIED when user lacks permission."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         query.model_name = "testmodel"
@@ -304,8 +245,6 @@ class TestExecuteAdd:
 
     def test_add_create_failure(self):
         """Should return CREATE_FAILED on database error."""
-        from django_flex.query import FlexQuery
-
         mock_model = MagicMock()
         mock_model.objects.create.side_effect = Exception("Database error")
 
@@ -319,17 +258,21 @@ class TestExecuteAdd:
         assert not result.success
         assert "Database error" in str(result.to_dict())
 
-    def test_add_debug_mode_includes_full_object(self, settings):
-        """When DEBUG=True, add response should include full object under model name key."""
-        from django_flex.query import FlexQuery
-
-        settings.DEBUG = True
+    @pytest.mark.parametrize(
+        "debug,includes_object",
+        [
+            pytest.param(True, True, id="debug_includes_full_object"),
+            pytest.param(False, False, id="non_debug_excludes_full_object"),
+        ],
+    )
+    def test_add_full_object_follows_debug(self, settings, debug, includes_object):
+        """Add response includes the full object under the model name key only when DEBUG=True."""
+        settings.DEBUG = debug
 
         mock_model = MagicMock()
         mock_obj = MagicMock()
         mock_obj.pk = 42
         mock_obj.name = "Test Item"
-        mock_obj.status = "active"
         mock_model.objects.create.return_value = mock_obj
         mock_model._meta.get_fields.return_value = []
 
@@ -343,53 +286,18 @@ class TestExecuteAdd:
         assert result.success
         assert result.code == "CREATED"
         assert result.data.get("id") == 42
-        # In DEBUG mode, should include full object under lowercase model name
-        assert "service" in result.data
-
-    def test_add_non_debug_mode_excludes_full_object(self, settings):
-        """When DEBUG=False, add response should NOT include full object."""
-        from django_flex.query import FlexQuery
-
-        settings.DEBUG = False
-
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 42
-        mock_model.objects.create.return_value = mock_obj
-        mock_model._meta.get_fields.return_value = []
-
-        query = FlexQuery("Service")
-        query.model = mock_model
-        query.model_name = "Service"
-
-        with patch.object(query, "_check_action_permission", return_value=None):
-            result = query._execute_add({"name": "Test"}, MagicMock(), {})
-
-        assert result.success
-        assert result.data.get("id") == 42
-        # In non-DEBUG mode, should NOT include full object
-        assert "service" not in result.data
+        # Full object is keyed by the lowercase model name
+        assert ("service" in result.data) is includes_object
 
 
 class TestExecuteDelete:
     """Tests for _execute_delete method."""
 
-    def test_delete_success(self):
+    def test_delete_success(self, query_with_perm):
         """Should successfully delete object."""
-        from django_flex.query import FlexQuery
-
-        mock_model = MagicMock()
-        mock_obj = MagicMock()
-        mock_obj.pk = 1
-        mock_model.objects.all.return_value.get.return_value = mock_obj
-        mock_model.DoesNotExist = Exception
+        query, _, mock_obj = query_with_perm()
 
-        query = FlexQuery("testmodel")
-        query.model = mock_model
-        query.model_name = "testmodel"
-
-        with patch.object(query, "_check_action_permission", return_value=None):
-            result = query._execute_delete({"id": 1}, MagicMock(), {})
+        result = query._execute_delete({"id": 1}, MagicMock(), {})
 
         assert result.success
         assert result.data.get("deleted") is True
@@ -397,8 +305,6 @@ class TestExecuteDelete:
 
     def test_delete_without_id_fails(self):
         """Should return error when id not provided."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         query.model_name = "testmodel"
@@ -411,71 +317,45 @@ class TestExecuteDelete:
 
     def test_delete_not_found(self):
         """Should return NOT_FOUND when object doesn't exist."""
-        from django_flex.query import FlexQuery
-        from django_flex.response import FlexResponse
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
         query.model_name = "testmodel"
 
-        not_found_error = FlexResponse.error("NOT_FOUND")
+        not_found_error = SimpleNamespace(success=False, code="NOT_FOUND", data={}, to_dict=lambda: {"code": "NOT_FOUND"})
 
         with patch.object(query, "_check_action_permission", return_value=None):
             with patch.object(query, "_get_object_by_id", return_value=(None, not_found_error)):
                 result = query._execute_delete({"id": 999}, MagicMock(), {})
 
+        assert result is not_found_error
         assert not result.success
 
 
 class TestExecuteActionRouting:
     """Tests for execute() method action routing."""
 
-    def test_routes_edit_action(self):
-        """Should route 'edit' action to _execute_edit."""
-        from django_flex.query import FlexQuery
-
+    @pytest.mark.parametrize(
+        "action,method,query_spec",
+        [
+            ("edit", "_execute_edit", {"id": 1, "name": "Test"}),
+            ("add", "_execute_add", {"name": "Test"}),
+            ("delete", "_execute_delete", {"id": 1}),
+        ],
+    )
+    def test_routes_action(self, action, method, query_spec):
+        """Should route each write action to its _execute_* method."""
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
-        with patch.object(query, "_execute_edit") as mock_edit:
-            mock_edit.return_value = MagicMock(success=True)
-
-            query.execute({"id": 1, "name": "Test"}, action="edit")
+        with patch.object(query, method) as mock_execute:
+            mock_execute.return_value = MagicMock(success=True)
 
-            mock_edit.assert_called_once()
+            query.execute(query_spec, action=action)
 
-    def test_routes_add_action(self):
-        """Should route 'add' action to _execute_add."""
-        from django_flex.query import FlexQuery
-
-        query = FlexQuery("testmodel")
-        query.model = MagicMock()
-
-        with patch.object(query, "_execute_add") as mock_add:
-            mock_add.return_value = MagicMock(success=True)
-
-            query.execute({"name": "Test"}, action="add")
-
-            mock_add.assert_called_once()
-
-    def test_routes_delete_action(self):
-        """Should route 'delete' action to _execute_delete."""
-        from django_flex.query import FlexQuery
-
-        query = FlexQuery("testmodel")
-        query.model = MagicMock()
-
-        with patch.object(query, "_execute_delete") as mock_delete:
-            mock_delete.return_value = MagicMock(success=True)
-
-            query.execute({"id": 1}, action="delete")
-
-            mock_delete.assert_called_once()
+            mock_execute.assert_called_once()
 
     def test_unknown_action_returns_error(self):
         """Should return error for unknown action."""
-        from django_flex.query import FlexQuery
-
         query = FlexQuery("testmodel")
         query.model = MagicMock()
 
@@ -488,41 +368,32 @@ class TestExecuteActionRouting:
 class TestFKInterchangeability:
     """Tests for ForeignKey interchangeability feature."""
 
-    def test_get_fk_fields_returns_fk_names(self):
-        """Should return set of FK field names."""
-        from django_flex.fields import get_fk_fields
-        from django.db import models
-
-        # Create a mock model with FK fields
+    @pytest.fixture(scope="class")
+    @classmethod
+    def fk_model(cls):
+        """Read-only mock model with a 'company' FK and a regular 'name' field (built once per class)."""
         mock_model = MagicMock()
 
         # Simulate ForeignKey fields
-        fk_field = MagicMock(spec=models.ForeignKey)
-        fk_field.name = "company"
+        fk_field = _fk("company")
 
         regular_field = MagicMock()
         regular_field.name = "name"
 
         mock_model._meta.get_fields.return_value = [fk_field, regular_field]
+        return mock_model
 
-        result = get_fk_fields(mock_model)
+    def test_get_fk_fields_returns_fk_names(self, fk_model):
+        """Should return set of FK field names."""
+        result = get_fk_fields(fk_model)
 
         assert "company" in result
         assert "name" not in result
 
-    def test_resolve_fk_values_converts_int_to_id_suffix(self):
+    def test_resolve_fk_values_converts_int_to_id_suffix(self, fk_model):
         """Should convert FK integer values to _id suffix pattern."""
-        from django_flex.fields import resolve_fk_values
-        from django.db import models
-
-        # Create mock model with FK field
-        mock_model = MagicMock()
-        fk_field = MagicMock(spec=models.ForeignKey)
-        fk_field.name = "company"
-        mock_model._meta.get_fields.return_value = [fk_field]
-
         data = {"company": 1, "name": "Test Service", "price": "50"}
-        result = resolve_fk_values(mock_model, data)
+        result = resolve_fk_values(fk_model, data)
 
         assert "company_id" in result
         assert result["company_id"] == 1
@@ -530,20 +401,12 @@ class TestFKInterchangeability:
         assert result["name"] == "Test Service"
         assert result["price"] == "50"
 
-    def test_resolve_fk_values_leaves_objects_unchanged(self):
+    def test_resolve_fk_values_leaves_objects_unchanged(self, fk_model):
         """Should leave FK object values unchanged (not convert to _id)."""
-        from django_flex.fields import resolve_fk_values
-        from django.db import models
-
-        mock_model = MagicMock()
-        fk_field = MagicMock(spec=models.ForeignKey)
-        fk_field.name = "company"
-        mock_model._meta.get_fields.return_value = [fk_field]
-
         company_obj = MagicMock()
         company_obj.pk = 1
         data = {"company": company_obj, "name": "Test"}
-        result = resolve_fk_values(mock_model, data)
+        result = resolve_fk_values(fk_model, data)
 
         # Object should stay as 'company', not converted to 'company_id'
         assert "company" in result
@@ -552,8 +415,6 @@ class TestFKInterchangeability:
 
     def test_resolve_fk_values_handles_non_fk_fields(self):
         """Should leave non-FK fields unchanged."""
-        from django_flex.fields import resolve_fk_values
-
         mock_model = MagicMock()
         mock_model._meta.get_fields.return_value = []
 
@@ -564,18 +425,12 @@ class TestFKInterchangeability:
 
     def test_add_with_fk_as_integer(self):
         """Should successfully create object when FK passed as integer."""
-        from django_flex.query import FlexQuery
-
         mock_model = MagicMock()
         mock_obj = MagicMock()
         mock_obj.pk = 42
 
         # Setup FK field detection
-        from django.db import models
-
-        fk_field = MagicMock(spec=models.ForeignKey)
-        fk_field.name = "company"
-        mock_model._meta.get_fields.return_value = [fk_field]
+        mock_model._meta.get_fields.return_value = [_fk("company")]
         mock_model.objects.create.return_value = mock_obj
 
         query = FlexQuery("testmodel")
@@ -590,15 +445,13 @@ class TestFKInterchangeability:
         assert result.success
         assert result.code == "CREATED"
         # Verify create was called with company_id (not company)
-        mock_model.objects.create.assert_called_once()
-        call_kwargs = mock_model.objects.create.call_args[1]
+        assert mock_model.objects.create.call_count == 1
+        call_kwargs = mock_model.objects.create.call_args.kwargs
         assert "company_id" in call_kwargs
         assert call_kwargs["company_id"] == 1
 
     def test_get_field_value_uses_id_column_for_simple_fk(self):
         """Should return raw _id value for simple FK field without fetching object."""
-        from django_flex.response import get_field_value
-
         mock_obj = MagicMock()
         mock_obj.company_id = 5  # Raw FK ID
 
@@ -610,8 +463,6 @@ class TestFKInterchangeability:
 
     def test_get_field_value_fetches_object_for_nested_fk(self):
         """Should fetch related object when accessing nested FK field like company.name."""
-        from django_flex.response import get_field_value
-
         mock_company = MagicMock()
         mock_company.name = "Acme Corp"
 
@@ -5,132 +5,90 @@ Tests for django_flex.ratelimit module.
 import pytest
 from unittest.mock import patch, MagicMock
 
+import django_flex.permissions as permissions_module
+import django_flex.ratelimit as ratelimit
+from django_flex.ratelimit import check_rate_limit, get_rate_limit_key, resolve_rate_limit
 
-class TestResolveRateLimit:
-    """Tests for resolve_rate_limit function."""
-
-    def test_no_permissions_returns_global(self):
-        from django_flex.ratelimit import resolve_rate_limit
-
-        with patch("django_flex.ratelimit.flex_settings") as mock_settings:
-            mock_settings.PERMISSIONS = {}
-            mock_settings.rate_limit = 100
-
-            result = resolve_rate_limit("booking", "authenticated", "query")
-            assert result == 100
-
-    def test_model_integer_limit(self):
-        from django_flex.ratelimit import resolve_rate_limit
-
-        permissions = {
-            "booking": {
-                "rate_limit": 50,
-                "authenticated": {"fields": ["*"], "ops": ["query"]},
-            }
-        }
-
-        result = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        assert result == 50
-
-    def test_model_dict_limit_action_specific(self):
-        from django_flex.ratelimit import resolve_rate_limit
+# Shared read-only permission configs
+_PERMS_LIMIT_10 = {
+    "booking": {
+        "rate_limit": 10,
+        "authenticated": {"fields": ["*"], "ops": ["query"]},
+    }
+}
+_PERMS_PER_ROLE = {
+    "booking": {
+        "rate_limit": 50,
+        "authenticated": {"fields": ["*"], "ops": ["query"], "rate_limit": 20},
+        "staff": {"fields": ["*"], "ops": ["query"], "rate_limit": 200},
+    }
+}
 
-        permissions = {
-            "booking": {
-                "rate_limit": {"default": 50, "query": 30},
-                "authenticated": {"fields": ["*"], "ops": ["query"]},
-            }
-        }
 
-        result = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        assert result == 30
+class FakeCache(dict):
+    """Dict-backed stand-in for django.core.cache.cache with get/set/incr semantics."""
 
-    def test_model_dict_limit_default(self):
-        from django_flex.ratelimit import resolve_rate_limit
+    def get(self, key, default=None):
+        return super().get(key, default)
 
-        permissions = {
-            "booking": {
-                "rate_limit": {"default": 50, "query": 30},
-                "authenticated": {"fields": ["*"], "ops": ["query"]},
-            }
-        }
+    def set(self, key, value, timeout=None):
+        self[key] = value
 
-        # 'get' not in dict, should use default
-        result = resolve_rate_limit("booking", "authenticated", "get", permissions)
-        assert result == 50
+    def incr(self, key, delta=1):
+        if key not in self:
+            raise ValueError(f"Key '{key}' not found")
+        self[key] += delta
+        return self[key]
 
-    def test_role_integer_limit_overrides_model(self):
-        from django_flex.ratelimit import resolve_rate_limit
 
-        permissions = {
-            "booking": {
-                "rate_limit": 50,
-                "authenticated": {
-                    "fields": ["*"],
-                    "ops": ["query"],
-                    "rate_limit": 20,
-                },
-            }
-        }
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(ratelimit, "cache", cache)
+    return cache
 
-        result = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        assert result == 20
 
-    def test_role_dict_limit_action_specific(self):
-        from django_flex.ratelimit import resolve_rate_limit
+class TestResolveRateLimit:
+    """Tests for resolve_rate_limit function."""
 
-        permissions = {
-            "booking": {
-                "rate_limit": 50,
-                "authenticated": {
-                    "fields": ["*"],
-                    "ops": ["query"],
-                    "rate_limit": {"default": 30, "query": 10},
-                },
-            }
-        }
+    def test_no_permissions_returns_global(self):
+        with patch("django_flex.ratelimit.flex_settings") as mock_settings:
+            mock_settings.PERMISSIONS = {}
+            mock_settings.rate_limit = 100
 
-        result = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        assert result == 10
+            result = resolve_rate_limit("booking", "authenticated", "query")
+            assert result == 100
 
-    def test_role_without_limit_uses_model_limit(self):
-        from django_flex.ratelimit import resolve_rate_limit
+    @pytest.mark.parametrize(
+        "model_limit,role_limit,action,expected",
+        [
+            pytest.param(50, None, "query", 50, id="model_integer_limit"),
+            pytest.param({"default": 50, "query": 30}, None, "query", 30, id="model_dict_limit_action_specific"),
+            # 'get' not in dict, should use default
+            pytest.param({"default": 50, "query": 30}, None, "get", 50, id="model_dict_limit_default"),
+            pytest.param(50, 20, "query", 20, id="role_integer_limit_overrides_model"),
+            pytest.param(50, {"default": 30, "query": 10}, "query", 10, id="role_dict_limit_action_specific"),
+            pytest.param(50, None, "query", 50, id="role_without_limit_uses_model_limit"),
+        ],
+    )
+    def test_limit_resolution(self, model_limit, role_limit, action, expected):
+        role_config = {"fields": ["*"], "ops": ["query"]}
+        if role_limit is not None:
+            role_config["rate_limit"] = role_limit
 
         permissions = {
             "booking": {
-                "rate_limit": 50,
-                "authenticated": {
-                    "fields": ["*"],
-                    "ops": ["query"],
-                    # No rate_limit for this role
-                },
+                "rate_limit": model_limit,
+                "authenticated": role_config,
             }
         }
 
-        result = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        assert result == 50
+        result = resolve_rate_limit("booking", "authenticated", action, permissions)
+        assert result == expected
 
     def test_different_roles_different_limits(self):
-        from django_flex.ratelimit import resolve_rate_limit
-
-        permissions = {
-            "booking": {
-                "rate_limit": 50,
-                "authenticated": {
-                    "fields": ["*"],
-                    "ops": ["query"],
-                    "rate_limit": 20,
-                },
-                "staff": {
-                    "fields": ["*"],
-                    "ops": ["query"],
-                    "rate_limit": 200,
-                },
-            }
-        }
-
-        auth_limit = resolve_rate_limit("booking", "authenticated", "query", permissions)
-        staff_limit = resolve_rate_limit("booking", "staff", "query", permissions)
+        auth_limit = resolve_rate_limit("booking", "authenticated", "query", _PERMS_PER_ROLE)
+        staff_limit = resolve_rate_limit("booking", "staff", "query", _PERMS_PER_ROLE)
 
         assert auth_limit == 20
         assert staff_limit == 200
@@ -139,16 +97,16 @@ class TestResolveRateLimit:
 class TestCheckRateLimit:
     """Tests for check_rate_limit function."""
 
-    def test_anonymous_user_always_allowed(self):
-        from django_flex.ratelimit import check_rate_limit
+    @pytest.fixture(autouse=True)
+    def _patch_role(self, monkeypatch):
+        monkeypatch.setattr(permissions_module, "get_user_role", lambda *args, **kwargs: "authenticated")
 
+    def test_anonymous_user_always_allowed(self):
         allowed, retry_after = check_rate_limit(None, "booking", "query")
         assert allowed is True
         assert retry_after == 0
 
     def test_superuser_bypasses_limits(self):
-        from django_flex.ratelimit import check_rate_limit
-
         user = MagicMock()
         user.is_authenticated = True
         user.is_superuser = True
@@ -159,82 +117,50 @@ class TestCheckRateLimit:
         assert allowed is True
         assert retry_after == 0
 
-    def test_no_limit_configured_always_allowed(self):
-        from django_flex.ratelimit import check_rate_limit
-
-        user = MagicMock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
-        user.groups.first.return_value = None
+    def test_no_limit_configured_always_allowed(self, anon_authenticated_user):
+        user = anon_authenticated_user
 
         # No rate_limit in permissions
         permissions = {"booking": {"authenticated": {"fields": ["*"], "ops": ["query"]}}}
 
-        with patch("django_flex.ratelimit.flex_settings") as mock_settings, patch("django_flex.permissions.get_user_role") as mock_get_role:
+        with patch("django_flex.ratelimit.flex_settings") as mock_settings:
             mock_settings.PERMISSIONS = permissions
             mock_settings.rate_limit = None
-            mock_get_role.return_value = "authenticated"
 
             allowed, retry_after = check_rate_limit(user, "booking", "query", permissions)
             assert allowed is True
 
-    def test_within_limit_allowed(self):
-        from django_flex.ratelimit import check_rate_limit
-
-        user = MagicMock()
-        user.pk = 123
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
-        user.groups.first.return_value = None
-
-        permissions = {
-            "booking": {
-                "rate_limit": 10,
-                "authenticated": {"fields": ["*"], "ops": ["query"]},
-            }
-        }
+    def test_within_limit_allowed(self, anon_authenticated_user, fake_cache):
+        user = anon_authenticated_user
 
-        with patch("django_flex.ratelimit.cache") as mock_cache, patch("django_flex.permissions.get_user_role") as mock_get_role:
-            mock_cache.get.return_value = 5  # 5 requests so far, limit is 10
-            mock_get_role.return_value = "authenticated"
+        key = get_rate_limit_key(user.pk, "booking", "query")
+        fake_cache[key] = 5  # 5 requests so far, limit is 10
 
-            allowed, retry_after = check_rate_limit(user, "booking", "query", permissions)
-            assert allowed is True
+        allowed, retry_after = check_rate_limit(user, "booking", "query", _PERMS_LIMIT_10)
+        assert allowed is True
+        assert fake_cache[key] == 6
 
-    def test_at_limit_rejected(self):
-        from django_flex.ratelimit import check_rate_limit
+    def test_first_request_starts_counter(self, anon_authenticated_user, fake_cache):
+        user = anon_authenticated_user
 
-        user = MagicMock()
-        user.pk = 123
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
-        user.groups.first.return_value = None
+        allowed, retry_after = check_rate_limit(user, "booking", "query", _PERMS_LIMIT_10)
+        assert allowed is True
+        assert fake_cache[get_rate_limit_key(user.pk, "booking", "query")] == 1
 
-        permissions = {
-            "booking": {
-                "rate_limit": 10,
-                "authenticated": {"fields": ["*"], "ops": ["query"]},
-            }
-        }
+    def test_at_limit_rejected(self, anon_authenticated_user, fake_cache):
+        user = anon_authenticated_user
 
-        with patch("django_flex.ratelimit.cache") as mock_cache, patch("django_flex.permissions.get_user_role") as mock_get_role:
-            mock_cache.get.return_value = 10  # At limit
-            mock_get_role.return_value = "authenticated"
+        fake_cache[get_rate_limit_key(user.pk, "booking", "query")] = 10  # At limit
 
-            allowed, retry_after = check_rate_limit(user, "booking", "query", permissions)
-            assert allowed is False
-            assert retry_after > 0
+        allowed, retry_after = check_rate_limit(user, "booking", "query", _PERMS_LIMIT_10)
+        assert allowed is False
+        assert retry_after > 0
 
 
 class TestGetRateLimitKey:
     """Tests for get_rate_limit_key function."""
 
     def test_key_format(self):
-        from django_flex.ratelimit import get_rate_limit_key
-
         key = get_rate_limit_key(123, "booking", "query")
 
         assert key.startswith("flex_rate:123:booking:query:")
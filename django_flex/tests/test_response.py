@@ -51,6 +51,63 @@ class TestBuildNestedResponse:
         assert result["customer"]["name"] == "Aisha Khan"
         assert result["customer"]["email"] == "aisha@example.com"
 
+    def test_batch_matches_per_object_build(self):
+        """build_nested_response_batch returns the same rows as per-object builds."""
+        from django_flex.response import build_nested_response, build_nested_response_batch
+
+        class MockCompany:
+            name = "Acme"
+
+        class MockCustomer:
+            name = "Aisha Khan"
+            email = "aisha@example.com"
+            company = MockCompany()
+
+        class MockBooking:
+            def __init__(self, pk, customer):
+                self.id = pk
+                self.status = "confirmed"
+                self.customer = customer
+
+        objs = [MockBooking(1, MockCustomer()), MockBooking(2, None), None]
+        fields = ["id", "customer.name", "status", "customer.company.name", "customer.email"]
+
+        batch = build_nested_response_batch(objs, fields)
+
+        assert batch == [build_nested_response(obj, fields) for obj in objs]
+        assert batch[1]["customer"] == {"name": None, "company": {"name": None}, "email": None}
+        assert batch[2] is None
+
+    def test_missing_relation_yields_none_leaves(self):
+        """A None relation keeps the nested shape with None leaves, in request order."""
+        from django_flex.response import build_nested_response
+
+        class MockBooking:
+            id = 1
+            customer = None
+
+        obj = MockBooking()
+        result = build_nested_response(obj, ["customer.name", "id", "customer.company.name"])
+
+        assert result == {"customer": {"name": None, "company": {"name": None}}, "id": 1}
+        assert list(result) == ["customer", "id"]
+
+    def test_nested_path_under_scalar_is_skipped(self):
+        """A nested path under a key already holding a scalar must not leak to the parent level."""
+        from django_flex.response import build_nested_response
+
+        class MockCustomer:
+            name = "Aisha Khan"
+
+        class MockBooking:
+            customer_id = 7
+            customer = MockCustomer()
+
+        obj = MockBooking()
+        result = build_nested_response(obj, ["customer", "customer.name"], fk_fields={"customer"})
+
+        assert result == {"customer": 7}
+
 
 class TestFlexResponse:
     """Tests for FlexResponse class."""
@@ -132,7 +189,6 @@ class TestAlwaysHttp200:
 
     def test_always_http_200_false_uses_real_status(self, settings):
         """When ALWAYS_HTTP_200=False, use real HTTP status codes."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -141,14 +197,13 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.error("NOT_FOUND", "Not found")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert json_response.status_code == 404
         assert "status_code" not in data
 
     def test_always_http_200_true_returns_200(self, settings):
         """When ALWAYS_HTTP_200=True, return HTTP 200 with status_code in payload."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -157,7 +212,7 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.error("NOT_FOUND", "Not found")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert json_response.status_code == 200
         assert data["status_code"] == 404
@@ -169,7 +224,6 @@ class TestAlwaysHttp200:
 
     def test_always_http_200_success_response(self, settings):
         """When ALWAYS_HTTP_200=True, success responses include success=True, no msg."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -178,7 +232,7 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.ok(id=1, name="Test")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert json_response.status_code == 200
         assert data["status_code"] == 200
@@ -192,7 +246,6 @@ class TestAlwaysHttp200:
 
     def test_always_http_200_error_includes_success_false(self, settings):
         """When ALWAYS_HTTP_200=True, error responses include success=False and error."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -201,7 +254,7 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.error("NOT_FOUND", "Object not found")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert json_response.status_code == 200
         assert data["status_code"] == 404
@@ -214,7 +267,6 @@ class TestAlwaysHttp200:
 
     def test_always_http_200_error_default_message(self, settings):
         """When ALWAYS_HTTP_200=True, error without message gets default from MSG_MAP."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -223,7 +275,7 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.error("PERMISSION_DENIED")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert data["success"] is False
         assert data["error"] == "Permission denied"
@@ -234,7 +286,6 @@ class TestAlwaysHttp200:
 
     def test_always_http_200_warning_response(self, settings):
         """When ALWAYS_HTTP_200=True, warning responses include warning field."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -243,7 +294,7 @@ class TestAlwaysHttp200:
 
         response = FlexResponse.warning_response("LIMIT_CLAMPED", limit=200)
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert data["success"] is True
         assert data["warning"] == "Limit was clamped to maximum allowed"
@@ -254,12 +305,52 @@ class TestAlwaysHttp200:
         flex_settings.reload()
 
 
+class TestCannedErrorResponses:
+    """Tests for pre-encoded bare error responses."""
+
+    @pytest.mark.parametrize("always_http_200", [False, True])
+    @pytest.mark.parametrize("message", [None, "Not found"])
+    def test_canned_body_matches_json_response(self, settings, always_http_200, message):
+        """Pre-encoded errors must be byte-identical to the uncanned encoding path."""
+        import json
+        from django.http import JsonResponse
+        from django_flex import jsonutils
+        from django_flex.response import FlexResponse
+        from django_flex.conf import flex_settings
+
+        settings.DJANGO_FLEX = {"ALWAYS_HTTP_200": always_http_200}
+        flex_settings.reload()
+
+        response = FlexResponse.error("NOT_FOUND", message)
+        json_response = response.to_json_response()
+        payload = response.to_dict(include_status_code=always_http_200)
+        expected = JsonResponse(payload, status=200 if always_http_200 else 404)
+
+        assert json_response.content == jsonutils.dumps(payload)
+        assert json.loads(json_response.content) == json.loads(expected.content)
+        assert json_response.flex_payload == payload
+        assert json_response.status_code == expected.status_code
+        assert json_response["Content-Type"] == "application/json"
+
+        # Cleanup
+        settings.DJANGO_FLEX = {}
+        flex_settings.reload()
+
+    def test_custom_message_not_canned(self):
+        """Errors with a custom message still include that message."""
+        from django_flex.response import FlexResponse
+
+        response = FlexResponse.error("NOT_FOUND", "Booking 42 not found")
+        data = response.to_json_response().flex_payload
+
+        assert data["error"] == "Booking 42 not found"
+
+
 class TestDebugModeResponses:
     """Tests for DEBUG mode specific response behaviors."""
 
     def test_internal_error_includes_exception_in_debug(self, settings):
         """When DEBUG=True and ALWAYS_HTTP_200=True, internal errors include exception."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -269,7 +360,7 @@ class TestDebugModeResponses:
 
         response = FlexResponse.error("INTERNAL_ERROR", "Traceback: ValueError at line 42")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert data["success"] is False
         assert data["status_code"] == 500
@@ -283,7 +374,6 @@ class TestDebugModeResponses:
 
     def test_internal_error_excludes_exception_in_non_debug(self, settings):
         """When DEBUG=False, internal errors should NOT expose exception details."""
-        import json
         from django_flex.response import FlexResponse
         from django_flex.conf import flex_settings
 
@@ -293,7 +383,7 @@ class TestDebugModeResponses:
 
         response = FlexResponse.error("INTERNAL_ERROR", "Sensitive traceback info")
         json_response = response.to_json_response()
-        data = json.loads(json_response.content)
+        data = json_response.flex_payload
 
         assert data["success"] is False
         assert "exception" not in data
@@ -302,3 +392,79 @@ class TestDebugModeResponses:
         settings.DJANGO_FLEX = {}
         settings.DEBUG = True
         flex_settings.reload()
+
+
+class TestJsonEncoding:
+    """Tests for the response body encoder."""
+
+    def test_to_json_bytes_matches_to_dict(self):
+        """to_json_bytes encodes exactly the to_dict payload for both modes."""
+        import json
+        from django_flex.response import FlexResponse
+
+        response = FlexResponse.error("INTERNAL_ERROR", "boom")
+
+        assert json.loads(response.to_json_bytes()) == response.to_dict()
+        assert json.loads(response.to_json_bytes(True)) == response.to_dict(include_status_code=True)
+        assert json.loads(response.to_json_bytes(True, include_exception=True))["exception"] == "boom"
+
+    def test_to_dict_built_once_per_mode(self):
+        """Payloads are built once per mode; callers only ever see copies."""
+        from django_flex.response import FlexResponse
+
+        response = FlexResponse.error("INTERNAL_ERROR", "boom")
+        cached = response._cached_dict(True)
+
+        assert response._cached_dict(True) is cached
+        assert response.to_dict(include_status_code=True) == cached
+        assert response.to_dict(include_status_code=True) is not cached
+        response.to_json_bytes(True, include_exception=True)
+        assert "exception" not in response.to_dict(include_status_code=True)
+
+    def test_caller_edits_do_not_leak_into_later_payloads(self):
+        """Editing to_dict() output or flex_payload leaves later serialisations untouched."""
+        from django_flex.response import FlexResponse
+
+        response = FlexResponse.ok(id=1)
+        response.to_dict()["id"] = 2
+        response.to_json_response().flex_payload["id"] = 3
+
+        assert response.to_dict() == {"id": 1}
+        assert response.to_json_response().flex_payload == {"id": 1}
+
+    def test_field_changes_rebuild_payload(self):
+        """Reassigned fields and in-place data edits show up in the next to_dict()."""
+        from django_flex.response import FlexResponse
+
+        response = FlexResponse.ok(id=1)
+        assert response.to_dict() == {"id": 1}
+
+        response.data["name"] = "Test"
+        assert response.to_dict() == {"id": 1, "name": "Test"}
+
+        response.data = {"id": 2}
+        response.code = "NOT_FOUND"
+        response.error_message = "gone"
+        assert response.to_dict() == {"error": "gone", "id": 2}
+        assert response.http_status == 404
+
+    def test_body_matches_django_json_encoder(self):
+        """Response bodies decode to the same values JsonResponse would produce."""
+        import datetime
+        import decimal
+        import json
+        import uuid
+        from django.core.serializers.json import DjangoJSONEncoder
+        from django_flex.response import FlexResponse
+
+        data = {
+            "when": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2024, 1, 2),
+            "price": decimal.Decimal("1.10"),
+            "ref": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "by_id": {1: "one"},
+        }
+        response = FlexResponse.ok(**data).to_json_response()
+
+        assert response["Content-Type"] == "application/json"
+        assert json.loads(response.content) == json.loads(json.dumps(data, cls=DjangoJSONEncoder))
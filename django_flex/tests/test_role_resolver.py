@@ -9,129 +9,120 @@ Tests cover:
 """
 
 import pytest
-from unittest.mock import Mock, patch
 from django.db.models import Q
 
+from django_flex.permissions import (
+    check_filter_permission,
+    check_order_permission,
+    check_permission,
+    clear_user_role_cache,
+    get_user_role,
+)
+
+
+class _FakeUser:
+    """Minimal authenticated user: only the attributes get_user_role and check_* read."""
+
+    def __init__(self, is_authenticated=True, is_superuser=False, is_staff=False, pk=None):
+        self.is_authenticated = is_authenticated
+        self.is_superuser = is_superuser
+        self.is_staff = is_staff
+        self.pk = pk
+
 
 class TestGetUserRoleWithResolver:
     """Tests for get_user_role with custom ROLE_RESOLVER."""
 
-    def test_resolver_returning_string(self):
+    def test_resolver_returning_string(self, stub_permission_settings):
         """Resolver that returns just a role string."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
+        user = _FakeUser()
 
         def simple_resolver(user, model_name):
             return "custom_role"
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = simple_resolver
-            result = get_user_role(user, "booking")
+        stub_permission_settings(ROLE_RESOLVER=simple_resolver)
+        result = get_user_role(user, "booking")
 
         assert result == "custom_role"
 
-    def test_resolver_returning_tuple(self):
+    def test_resolver_returning_tuple(self, stub_permission_settings):
         """Resolver that returns (role, row_filter) tuple."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
-        user.pk = 42
+        user = _FakeUser(pk=42)
 
         expected_filter = Q(company__user=user)
 
         def tuple_resolver(user, model_name):
             return ("manager", expected_filter)
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            result = get_user_role(user, "booking")
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver)
+        result = get_user_role(user, "booking")
 
         assert isinstance(result, tuple)
         assert result[0] == "manager"
         assert str(result[1]) == str(expected_filter)
 
-    def test_resolver_returning_none_falls_back(self):
+    def test_resolver_returning_none_falls_back(self, stub_permission_settings):
         """When resolver returns None, fall back to default resolution."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = True
-        user.is_staff = False
+        user = _FakeUser(is_superuser=True)
 
         def none_resolver(user, model_name):
             return None
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = none_resolver
-            result = get_user_role(user, "booking")
+        stub_permission_settings(ROLE_RESOLVER=none_resolver)
+        result = get_user_role(user, "booking")
 
         assert result == "superuser"
 
-    def test_resolver_role_is_lowercased(self):
+    def test_resolver_role_is_lowercased(self, stub_permission_settings):
         """Resolver's role should be lowercased."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
+        user = _FakeUser()
 
         def uppercase_resolver(user, model_name):
             return "OWNER"
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = uppercase_resolver
-            result = get_user_role(user, "company")
+        stub_permission_settings(ROLE_RESOLVER=uppercase_resolver)
+        result = get_user_role(user, "company")
 
         assert result == "owner"
 
-    def test_resolver_tuple_role_is_lowercased(self):
+    def test_resolver_tuple_role_is_lowercased(self, stub_permission_settings):
         """Tuple resolver's role should also be lowercased."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = False
+        user = _FakeUser()
 
         def tuple_resolver(user, model_name):
             return ("MANAGER", Q())
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            result = get_user_role(user, "company")
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver)
+        result = get_user_role(user, "company")
 
         assert result[0] == "manager"
 
-    def test_no_resolver_uses_default_logic(self):
+    def test_no_resolver_uses_default_logic(self, stub_permission_settings):
         """Without ROLE_RESOLVER, use default Django auth logic."""
-        from django_flex.permissions import get_user_role
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.is_staff = True
+        user = _FakeUser(is_staff=True)
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = None
-            result = get_user_role(user, "booking")
+        stub_permission_settings(ROLE_RESOLVER=None)
+        result = get_user_role(user, "booking")
 
         assert result == "staff"
 
-    def test_model_name_passed_to_resolver(self):
-        """Model name should be passed to the resolver."""
-        from django_flex.permissions import get_user_role
+    @pytest.mark.parametrize(
+        "is_superuser, is_staff, expected",
+        [(True, True, "superuser"), (True, False, "superuser"), (False, True, "staff")],
+    )
+    def test_default_roles_from_user_flags(
+        self, stub_permission_settings, is_superuser, is_staff, expected
+    ):
+        """Superuser wins over staff in the default resolution."""
+        user = _FakeUser(is_superuser=is_superuser, is_staff=is_staff)
+
+        stub_permission_settings(ROLE_RESOLVER=None)
 
-        user = Mock()
-        user.is_authenticated = True
+        assert get_user_role(user, "booking") == expected
+
+    def test_model_name_passed_to_resolver(self, stub_permission_settings):
+        """Model name should be passed to the resolver."""
+        user = _FakeUser()
 
         received_model_name = []
 
@@ -139,24 +130,47 @@ class TestGetUserRoleWithResolver:
             received_model_name.append(model_name)
             return "test_role"
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = capturing_resolver
-            get_user_role(user, "my_model")
+        stub_permission_settings(ROLE_RESOLVER=capturing_resolver)
+        get_user_role(user, "my_model")
 
         assert received_model_name == ["my_model"]
 
+    def test_resolver_called_once_per_user_and_model(self, stub_permission_settings):
+        """Repeated lookups for the same user and model reuse the first resolution."""
+        user = _FakeUser()
+
+        calls = []
+
+        def counting_resolver(user, model_name):
+            calls.append(model_name)
+            return ("editor", Q(pk=1))
+
+        stub_permission_settings(ROLE_RESOLVER=counting_resolver)
+        first = get_user_role(user, "article")
+        second = get_user_role(user, "article")
+        get_user_role(user, "booking")
+
+        assert first is second
+        assert calls == ["article", "booking"]
+
+    def test_clear_user_role_cache_forces_resolution(self, stub_permission_settings):
+        """clear_user_role_cache drops memoized roles so the resolver runs again."""
+        user = _FakeUser()
+
+        roles = iter(["viewer", "editor"])
+
+        stub_permission_settings(ROLE_RESOLVER=lambda user, model_name: next(roles))
+        assert get_user_role(user, "article") == "viewer"
+        clear_user_role_cache(user)
+        assert get_user_role(user, "article") == "editor"
+
 
 class TestCheckPermissionWithResolverRowFilter:
     """Tests for check_permission using resolver's row_filter."""
 
-    def test_uses_resolver_row_filter_when_config_has_no_rows(self):
+    def test_uses_resolver_row_filter_when_config_has_no_rows(self, stub_permission_settings):
         """When config doesn't specify rows, use resolver's row_filter."""
-        from django_flex.permissions import check_permission
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.pk = 42
+        user = _FakeUser(pk=42)
 
         resolver_filter = Q(company_id=99)
 
@@ -173,22 +187,14 @@ class TestCheckPermissionWithResolverRowFilter:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            mock_settings.PERMISSIONS = permissions
-            mock_settings.MAX_RELATION_DEPTH = 2
-            row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver, PERMISSIONS=permissions, MAX_RELATION_DEPTH=2)
+        row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
 
         assert str(row_filter) == str(resolver_filter)
 
-    def test_config_rows_override_resolver_row_filter(self):
+    def test_config_rows_override_resolver_row_filter(self, stub_permission_settings):
         """Config's rows should override resolver's row_filter."""
-        from django_flex.permissions import check_permission
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.pk = 42
+        user = _FakeUser(pk=42)
 
         resolver_filter = Q(company_id=99)
         config_filter = Q(owner_id=user.pk)
@@ -206,22 +212,14 @@ class TestCheckPermissionWithResolverRowFilter:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            mock_settings.PERMISSIONS = permissions
-            mock_settings.MAX_RELATION_DEPTH = 2
-            row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver, PERMISSIONS=permissions, MAX_RELATION_DEPTH=2)
+        row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
 
         assert str(row_filter) == str(config_filter)
 
-    def test_config_rows_star_allows_all(self):
+    def test_config_rows_star_allows_all(self, stub_permission_settings):
         """Config rows='*' should allow all rows (no filter)."""
-        from django_flex.permissions import check_permission
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.pk = 42
+        user = _FakeUser(pk=42)
 
         resolver_filter = Q(company_id=99)
 
@@ -238,23 +236,15 @@ class TestCheckPermissionWithResolverRowFilter:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            mock_settings.PERMISSIONS = permissions
-            mock_settings.MAX_RELATION_DEPTH = 2
-            row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver, PERMISSIONS=permissions, MAX_RELATION_DEPTH=2)
+        row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
 
         # Empty Q() means no filter (all rows)
         assert str(row_filter) == str(Q())
 
-    def test_no_row_filter_anywhere_allows_all(self):
+    def test_no_row_filter_anywhere_allows_all(self, stub_permission_settings):
         """Without rows in config or resolver, allow all rows."""
-        from django_flex.permissions import check_permission
-
-        user = Mock()
-        user.is_authenticated = True
-        user.is_superuser = False
-        user.pk = 42
+        user = _FakeUser(pk=42)
 
         def string_resolver(user, model_name):
             return "viewer"  # No row_filter
@@ -269,11 +259,8 @@ class TestCheckPermissionWithResolverRowFilter:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = string_resolver
-            mock_settings.PERMISSIONS = permissions
-            mock_settings.MAX_RELATION_DEPTH = 2
-            row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
+        stub_permission_settings(ROLE_RESOLVER=string_resolver, PERMISSIONS=permissions, MAX_RELATION_DEPTH=2)
+        row_filter, fields = check_permission(user, "article", "get", ["id"], permissions)
 
         # No filter = all rows
         assert str(row_filter) == str(Q())
@@ -282,12 +269,9 @@ class TestCheckPermissionWithResolverRowFilter:
 class TestTupleHandlingInOtherFunctions:
     """Tests for tuple handling in check_filter_permission and check_order_permission."""
 
-    def test_check_filter_permission_handles_tuple(self):
+    def test_check_filter_permission_handles_tuple(self, stub_permission_settings):
         """check_filter_permission should handle tuple from resolver."""
-        from django_flex.permissions import check_filter_permission
-
-        user = Mock()
-        user.is_authenticated = True
+        user = _FakeUser()
 
         def tuple_resolver(user, model_name):
             return ("editor", Q(pk=1))
@@ -302,19 +286,13 @@ class TestTupleHandlingInOtherFunctions:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            mock_settings.PERMISSIONS = permissions
-            mock_settings.MAX_RELATION_DEPTH = 2
-            # Should not raise
-            check_filter_permission(user, "article", ["id"], permissions)
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver, PERMISSIONS=permissions, MAX_RELATION_DEPTH=2)
+        # Should not raise
+        check_filter_permission(user, "article", ["id"], permissions)
 
-    def test_check_order_permission_handles_tuple(self):
+    def test_check_order_permission_handles_tuple(self, stub_permission_settings):
         """check_order_permission should handle tuple from resolver."""
-        from django_flex.permissions import check_order_permission
-
-        user = Mock()
-        user.is_authenticated = True
+        user = _FakeUser()
 
         def tuple_resolver(user, model_name):
             return ("editor", Q(pk=1))
@@ -329,8 +307,6 @@ class TestTupleHandlingInOtherFunctions:
             }
         }
 
-        with patch("django_flex.permissions.flex_settings") as mock_settings:
-            mock_settings.ROLE_RESOLVER = tuple_resolver
-            mock_settings.PERMISSIONS = permissions
-            # Should not raise
-            check_order_permission(user, "article", "created_at", permissions)
+        stub_permission_settings(ROLE_RESOLVER=tuple_resolver, PERMISSIONS=permissions)
+        # Should not raise
+        check_order_permission(user, "article", "created_at", permissions)
@@ -27,84 +27,108 @@ USAGE:
     pytest -k "security" -v  # All security tests
 """
 
+from types import MappingProxyType
+from typing import NamedTuple
+
 import pytest
 
 
 # =============================================================================
 # Security Test Summary
 # =============================================================================
-SECURITY_ISSUES = {
-    "H1": {
-        "title": "Hardcoded app.models.Session import",
-        "severity": "CRITICAL",
-        "file": "test_security_h1.py",
-        "issue": "#2",
-        "fixed": False,
-    },
-    "H2": {
-        "title": "CSRF Exempt on all views",
-        "severity": "CRITICAL",
-        "file": "test_security_h2.py",
-        "issue": "#3",
-        "fixed": False,
-    },
-    "H3": {
-        "title": "Anonymous user bypasses ALL permission checks",
-        "severity": "CRITICAL",
-        "file": "test_security_h3.py",
-        "issue": "#4",
-        "fixed": False,
-    },
-    "H4": {
-        "title": "Wildcard '*' pattern documentation contradiction",
-        "severity": "HIGH",
-        "file": "test_security_h4.py",
-        "issue": "#5",
-        "fixed": False,
-    },
-    "H5": {
-        "title": "MAX_RELATION_DEPTH not enforced on fields",
-        "severity": "HIGH",
-        "file": "test_security_h5.py",
-        "issue": "#6",
-        "fixed": False,
-    },
-    "M1": {
-        "title": "Rate limit bypass via IP spoofing",
-        "severity": "MEDIUM",
-        "file": "test_security_medium.py",
-        "issue": "#7",
-        "fixed": False,
-    },
-    "M2": {
-        "title": "Silent exception swallowing",
-        "severity": "MEDIUM",
-        "file": "test_security_medium.py",
-        "issue": "#8",
-        "fixed": False,
-    },
-    "M3": {
-        "title": "No input validation on filter values",
-        "severity": "MEDIUM",
-        "file": "test_security_medium.py",
-        "issue": "#9",
-        "fixed": False,
-    },
-    "M4": {
-        "title": "FlexModelView allowed_models default allows all",
-        "severity": "MEDIUM",
-        "file": "test_security_medium.py",
-        "issue": "#10",
-        "fixed": False,
-    },
-    "M5": {
-        "title": "Superuser cannot access unconfigured models (docs)",
-        "severity": "LOW",
-        "file": "test_security_medium.py",
-        "issue": "#11",
-        "fixed": False,
-    },
-}
+class IssueInfo(NamedTuple):
+    id: str
+    title: str
+    severity: str
+    file: str
+    issue: str
+    fixed: bool
+
+
+_ISSUES = (
+    IssueInfo(
+        id="H1",
+        title="Hardcoded app.models.Session import",
+        severity="CRITICAL",
+        file="test_security_h1.py",
+        issue="#2",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="H2",
+        title="CSRF Exempt on all views",
+        severity="CRITICAL",
+        file="test_security_h2.py",
+        issue="#3",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="H3",
+        title="Anonymous user bypasses ALL permission checks",
+        severity="CRITICAL",
+        file="test_security_h3.py",
+        issue="#4",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="H4",
+        title="Wildcard '*' pattern documentation contradiction",
+        severity="HIGH",
+        file="test_security_h4.py",
+        issue="#5",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="H5",
+        title="MAX_RELATION_DEPTH not enforced on fields",
+        severity="HIGH",
+        file="test_security_h5.py",
+        issue="#6",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="M1",
+        title="Rate limit bypass via IP spoofing",
+        severity="MEDIUM",
+        file="test_security_medium.py",
+        issue="#7",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="M2",
+        title="Silent exception swallowing",
+        severity="MEDIUM",
+        file="test_security_medium.py",
+        issue="#8",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="M3",
+        title="No input validation on filter values",
+        severity="MEDIUM",
+        file="test_security_medium.py",
+        issue="#9",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="M4",
+        title="FlexModelView allowed_models default allows all",
+        severity="MEDIUM",
+        file="test_security_medium.py",
+        issue="#10",
+        fixed=False,
+    ),
+    IssueInfo(
+        id="M5",
+        title="Superuser cannot access unconfigured models (docs)",
+        severity="LOW",
+        file="test_security_medium.py",
+        issue="#11",
+        fixed=False,
+    ),
+)
+
+SECURITY_ISSUES = MappingProxyType({info.id: info for info in _ISSUES})
 
 
 @pytest.fixture
@@ -123,12 +147,12 @@ class TestSecuritySummary:
         print("=" * 60)
 
         for issue_id, info in security_status.items():
-            status = "✅ FIXED" if info["fixed"] else "❌ VULNERABLE"
-            print(f"{issue_id} [{info['severity']}] {status}: {info['title']}")
+            status = "✅ FIXED" if info.fixed else "❌ VULNERABLE"
+            print(f"{issue_id} [{info.severity}] {status}: {info.title}")
 
         print("=" * 60)
 
-        unfixed = [k for k, v in security_status.items() if not v["fixed"]]
+        unfixed = [k for k, v in security_status.items() if not v.fixed]
         if unfixed:
             print(f"WARNING: {len(unfixed)} security issues remain unfixed!")
             print(f"Unfixed: {', '.join(unfixed)}")
@@ -138,23 +162,22 @@ class TestSecuritySummary:
 
     def test_critical_issues_exist(self, security_status):
         """Track that critical issues are known."""
-        critical = [k for k, v in security_status.items() if v["severity"] == "CRITICAL"]
+        critical = [k for k, v in security_status.items() if v.severity == "CRITICAL"]
         assert len(critical) == 3, f"Expected 3 CRITICAL issues, found: {critical}"
 
     def test_high_issues_exist(self, security_status):
         """Track that high issues are known."""
-        high = [k for k, v in security_status.items() if v["severity"] == "HIGH"]
+        high = [k for k, v in security_status.items() if v.severity == "HIGH"]
         assert len(high) == 2, f"Expected 2 HIGH issues, found: {high}"
 
 
 # =============================================================================
 # Parameterized tests for all issues
 # =============================================================================
-@pytest.mark.parametrize("issue_id,info", SECURITY_ISSUES.items())
-def test_security_issue_documented(issue_id, info):
+@pytest.mark.parametrize("info", _ISSUES, ids=[info.id for info in _ISSUES])
+def test_security_issue_documented(info):
     """Verify each security issue has proper documentation."""
-    assert "title" in info
-    assert "severity" in info
-    assert "file" in info
-    assert "issue" in info
-    assert info["severity"] in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+    assert info.title
+    assert info.file
+    assert info.issue
+    assert info.severity in ("CRITICAL", "HIGH", "MEDIUM", "LOW")
@@ -9,20 +9,14 @@ These tests will FAIL when the vulnerability exists and PASS once fixed.
 Related Issue: #2 [H1] CRITICAL: Hardcoded app.models.Session import
 """
 
-import pytest
-from unittest.mock import patch, MagicMock
-from django.test import RequestFactory, override_settings
-
-from django_flex.tests.test_utils import run_tests
+from types import SimpleNamespace
 
+import pytest
+from django.test import override_settings
 
-# =============================================================================
-# State variables for tests
-# =============================================================================
-state = {
-    "token": "test-token-12345",
-    "user_id": 1,
-}
+from django_flex.conf import flex_settings
+from django_flex.middleware import FlexQueryMiddleware
+from django_flex.tests.test_utils import SecurityTestCase, case_params, ref, run_single_test
 
 
 # =============================================================================
@@ -30,12 +24,8 @@ state = {
 # =============================================================================
 def setup_mock_session_model(state):
     """Setup a mock session model for testing configurable imports."""
-    from django.contrib.auth import get_user_model
-
-    User = get_user_model()
-    state["mock_user"] = MagicMock(spec=User)
-    state["mock_user"].id = state["user_id"]
-    state["mock_user"].is_authenticated = True
+    # Only the attributes the middleware reads; spec=User would walk the model _meta
+    state["mock_user"] = SimpleNamespace(id=state["user_id"], is_authenticated=True)
 
 
 # =============================================================================
@@ -45,49 +35,49 @@ TEST_CASES = [
     # ========================================
     # H1-1: Configurable SESSION_MODEL setting
     # ========================================
-    {
-        "name": "H1-1: SESSION_MODEL=None disables token auth gracefully",
-        "setup": setup_mock_session_model,
-        "req": {
+    SecurityTestCase(
+        name="H1-1: SESSION_MODEL=None disables token auth gracefully",
+        setup=setup_mock_session_model,
+        req={
             "_model": "testmodel",
             "_action": "list",
-            "__token": "!token",
+            "__token": ref("token"),
         },
-        "res": {
+        res={
             # Should proceed without error (token auth disabled, not crashed)
             # Expect permission denied (not ImportError)
             "success": False,
         },
-        "expect_error": True,  # FAILS until SESSION_MODEL setting is implemented
-    },
-    {
-        "name": "H1-2: Custom SESSION_MODEL path works",
-        "setup": setup_mock_session_model,
-        "req": {
+        expect_error=True,  # FAILS until SESSION_MODEL setting is implemented
+    ),
+    SecurityTestCase(
+        name="H1-2: Custom SESSION_MODEL path works",
+        setup=setup_mock_session_model,
+        req={
             "_model": "testmodel",
             "_action": "list",
-            "__token": "!token",
+            "__token": ref("token"),
         },
-        "res": {
+        res={
             # With custom session model configured, should authenticate
             "success": True,
         },
-        "expect_error": True,  # FAILS until configurable import is implemented
-    },
-    {
-        "name": "H1-3: Invalid SESSION_MODEL logs error, doesn't crash",
-        "setup": setup_mock_session_model,
-        "req": {
+        expect_error=True,  # FAILS until configurable import is implemented
+    ),
+    SecurityTestCase(
+        name="H1-3: Invalid SESSION_MODEL logs error, doesn't crash",
+        setup=setup_mock_session_model,
+        req={
             "_model": "testmodel",
             "_action": "list",
-            "__token": "!token",
+            "__token": ref("token"),
         },
-        "res": {
+        res={
             # Should not crash, should log error and disable token auth
-            "success": lambda x: isinstance(x, bool),
+            "success": bool,
         },
-        "expect_error": True,  # FAILS until proper error handling added
-    },
+        expect_error=True,  # FAILS until proper error handling added
+    ),
 ]
 
 
@@ -109,8 +99,6 @@ class TestH1HardcodedSessionImport:
         Expected: Middleware uses flex_settings.SESSION_MODEL for import.
         Actual (before fix): Hardcoded 'from app.models import Session'
         """
-        from django_flex.conf import flex_settings
-
         # This should not raise AttributeError after fix
         try:
             session_model = flex_settings.SESSION_MODEL
@@ -119,26 +107,23 @@ class TestH1HardcodedSessionImport:
         except AttributeError:
             pytest.fail("H1 VULNERABILITY: SESSION_MODEL setting does not exist. " "Middleware cannot be configured for different session models.")
 
-    def test_middleware_no_import_error_without_app_models(self):
+    def test_middleware_no_import_error_without_app_models(self, request_factory, monkeypatch):
         """
         Test that middleware doesn't crash when app.models.Session doesn't exist.
 
         Expected: Graceful handling when session model not configured.
         Actual (before fix): ImportError: No module named 'app'
         """
-        from django_flex.middleware import FlexQueryMiddleware
-
-        factory = RequestFactory()
-        request = factory.post("/", {"__token": "test-token"})
+        request = request_factory.post("/", {"__token": "test-token"})
 
         middleware = FlexQueryMiddleware(lambda r: r)
+        # Force a token so the session model lookup runs
+        monkeypatch.setattr(middleware, "_extract_token", lambda request, body=None: "test-token")
 
         # This should not raise ImportError
         try:
-            # Mock the _resolve_user_from_token method to test import behavior
-            with patch.object(middleware, "_extract_token", return_value="test-token"):
-                # Calling middleware should not crash
-                middleware._resolve_user_from_token(request)
+            # Calling middleware should not crash
+            middleware._resolve_user_from_token(request)
         except ImportError as e:
             if "app.models" in str(e) or "No module named 'app'" in str(e):
                 pytest.fail(f"H1 VULNERABILITY: Hardcoded import crashed: {e}. " "Middleware must use configurable SESSION_MODEL setting.")
@@ -151,8 +136,6 @@ class TestH1HardcodedSessionImport:
         Expected: Configurable via SESSION_MODEL = 'myapp.models.CustomSession'
         Actual (before fix): Only works with app.models.Session
         """
-        from django_flex.conf import flex_settings
-
         # Check if SESSION_TOKEN_FIELD exists
         try:
             token_field = flex_settings.SESSION_TOKEN_FIELD
@@ -171,13 +154,8 @@ class TestH1HardcodedSessionImport:
 # =============================================================================
 # Integration test runner
 # =============================================================================
-@pytest.fixture
-def setup_db(db):
-    """Create test fixtures for H1 tests."""
-    pass  # No DB fixtures needed for import/config tests
-
-
 @pytest.mark.django_db
-def test_h1_hardcoded_session(setup_db, subtests):
-    """Run all H1 security test cases."""
-    run_tests(TEST_CASES, state, subtests)
+@pytest.mark.parametrize("case", case_params(TEST_CASES))
+def test_h1_hardcoded_session(setup_db, flex_state, case):
+    """Run one H1 security test case."""
+    run_single_test(case, flex_state)
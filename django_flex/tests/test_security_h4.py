@@ -9,15 +9,14 @@ These tests verify actual behavior and document expected behavior.
 Related Issue: #5 [H4] HIGH: Wildcard '*' pattern documentation contradicts code comment
 """
 
-import pytest
-
-from django_flex.tests.test_utils import run_tests
+from types import SimpleNamespace as _F
+from unittest.mock import MagicMock, patch
 
+import pytest
 
-# =============================================================================
-# State variables for tests
-# =============================================================================
-state = {}
+from django_flex.fields import expand_fields
+from django_flex.permissions import field_matches_pattern, fields_allowed
+from django_flex.tests.test_utils import cached_source, case_params, run_single_test
 
 
 # =============================================================================
@@ -28,6 +27,10 @@ state = {}
 TEST_CASES = []
 
 
+# The misleading comment once carried by field_matches_pattern
+_MISLEADING = '"*" matches EVERYTHING (base and nested fields)'
+
+
 # =============================================================================
 # Unit tests for the specific pattern behavior
 # =============================================================================
@@ -48,8 +51,6 @@ class TestH4WildcardPattern:
 
         Expected: field_matches_pattern('id', '*') == True
         """
-        from django_flex.permissions import field_matches_pattern
-
         assert field_matches_pattern("id", "*") is True
         assert field_matches_pattern("name", "*") is True
         assert field_matches_pattern("created_at", "*") is True
@@ -61,8 +62,6 @@ class TestH4WildcardPattern:
         Expected: field_matches_pattern('customer.name', '*') == False
         Documentation: `*` matches "All direct fields on model" (not nested)
         """
-        from django_flex.permissions import field_matches_pattern
-
         result = field_matches_pattern("customer.name", "*")
 
         assert result is False, (
@@ -74,8 +73,6 @@ class TestH4WildcardPattern:
         """
         Test various nested field patterns against wildcard.
         """
-        from django_flex.permissions import field_matches_pattern
-
         nested_fields = [
             "customer.name",
             "customer.company.name",
@@ -93,15 +90,9 @@ class TestH4WildcardPattern:
 
         This test checks if the misleading comment has been fixed.
         """
-        import inspect
-        from django_flex.permissions import field_matches_pattern
+        source = cached_source(field_matches_pattern)
 
-        source = inspect.getsource(field_matches_pattern)
-
-        # The misleading comment says:
-        misleading = '"*" matches EVERYTHING (base and nested fields)'
-
-        if misleading in source:
+        if source.find(_MISLEADING) != -1:
             pytest.fail(
                 "H4 DOCUMENTATION BUG: Code comment claims '*' matches "
                 "'EVERYTHING (base and nested fields)' but tests prove this is false. "
@@ -114,8 +105,6 @@ class TestH4WildcardPattern:
 
         Expected: 'customer.*' matches 'customer.name', 'customer.id', etc.
         """
-        from django_flex.permissions import field_matches_pattern
-
         # relation.* should match all fields on that relation
         assert field_matches_pattern("customer.name", "customer.*") is True
         assert field_matches_pattern("customer.id", "customer.*") is True
@@ -130,8 +119,6 @@ class TestH4WildcardPattern:
         """
         Test that explicit field patterns match exactly.
         """
-        from django_flex.permissions import field_matches_pattern
-
         assert field_matches_pattern("customer.name", "customer.name") is True
         assert field_matches_pattern("customer.id", "customer.name") is False
         assert field_matches_pattern("name", "customer.name") is False
@@ -149,8 +136,6 @@ class TestH4DocumentationConsistency:
         """
         Test fields_allowed function behavior with wildcard.
         """
-        from django_flex.permissions import fields_allowed
-
         # Base fields should be allowed with '*'
         allowed, denied = fields_allowed(["id", "name", "status"], ["*"])
         assert allowed is True, f"Base fields rejected with '*': {denied}"
@@ -166,35 +151,13 @@ class TestH4DocumentationConsistency:
         """
         Test that expand_fields('*') only returns base model fields.
         """
-        from django_flex.fields import expand_fields
-        from unittest.mock import MagicMock, patch
+        # Plain attribute bags: the test only reads the field flags below
+        id_field = _F(name="id", is_relation=False, concrete=True, many_to_many=False, one_to_many=False)
+        base_field = _F(name="name", is_relation=False, concrete=True, many_to_many=False, one_to_many=False)
+        fk_field = _F(name="customer", is_relation=True, concrete=True, many_to_many=False, one_to_many=False)
 
-        # Mock a model with various field types
         mock_model = MagicMock()
         mock_model.__name__ = "MockModel"
-
-        # Create mock fields
-        base_field = MagicMock()
-        base_field.name = "name"
-        base_field.is_relation = False
-        base_field.concrete = True
-        base_field.many_to_many = False
-        base_field.one_to_many = False
-
-        id_field = MagicMock()
-        id_field.name = "id"
-        id_field.is_relation = False
-        id_field.concrete = True
-        id_field.many_to_many = False
-        id_field.one_to_many = False
-
-        fk_field = MagicMock()
-        fk_field.name = "customer"
-        fk_field.is_relation = True
-        fk_field.concrete = True
-        fk_field.many_to_many = False
-        fk_field.one_to_many = False
-
         mock_model._meta.get_fields.return_value = [id_field, base_field, fk_field]
 
         # Mock get_model_fields and get_model_relations
@@ -218,13 +181,8 @@ class TestH4DocumentationConsistency:
 # =============================================================================
 # Integration test runner
 # =============================================================================
-@pytest.fixture
-def setup_db(db):
-    """Create test fixtures for H4 tests."""
-    pass
-
-
 @pytest.mark.django_db
-def test_h4_wildcard_pattern(setup_db, subtests):
-    """Run all H4 test cases."""
-    run_tests(TEST_CASES, state, subtests)
+@pytest.mark.parametrize("case", case_params(TEST_CASES))
+def test_h4_wildcard_pattern(setup_db, flex_state, case):
+    """Run one H4 test case."""
+    run_single_test(case, flex_state)
@@ -12,6 +12,9 @@ Related Issue: #6 [H5] HIGH: MAX_RELATION_DEPTH not enforced on field selection
 import pytest
 from unittest.mock import patch, MagicMock
 
+from django_flex.conf import flex_settings
+from django_flex.fields import expand_fields
+from django_flex.permissions import check_filter_permission, check_permission
 from django_flex.tests.test_utils import run_tests
 
 
@@ -33,6 +36,19 @@ state = {
 TEST_CASES = []
 
 
+@pytest.fixture(scope="module")
+def deep_paths():
+    """Relation paths around MAX_RELATION_DEPTH, built once per module."""
+    max_depth = flex_settings.MAX_RELATION_DEPTH
+    too_deep = ".".join(["relation"] * (max_depth + 2))
+    return {
+        "filter": too_deep + ".id.eq",
+        "field": too_deep + ".name",
+        "allowed": ".".join(["rel"] * max_depth) + ".field",
+        "rejected": ".".join(["rel"] * (max_depth + 1)) + ".field",
+    }
+
+
 # =============================================================================
 # Unit tests for the specific vulnerability
 # =============================================================================
@@ -44,19 +60,16 @@ class TestH5RelationDepth:
     This allows attackers to request arbitrarily deep field traversals.
     """
 
-    def test_filter_depth_is_checked(self):
+    def test_filter_depth_is_checked(self, deep_paths):
         """
         Verify that filter keys ARE checked against MAX_RELATION_DEPTH.
 
         This is the EXISTING correct behavior that should be replicated for fields.
         """
-        from django_flex.permissions import check_filter_permission
-        from django_flex.conf import flex_settings
-
         max_depth = flex_settings.MAX_RELATION_DEPTH
 
-        # Create a filter that exceeds depth
-        deep_filter_key = ".".join(["relation"] * (max_depth + 2)) + ".id.eq"
+        # A filter that exceeds depth
+        deep_filter_key = deep_paths["filter"]
 
         permissions = {
             "testmodel": {
@@ -81,20 +94,17 @@ class TestH5RelationDepth:
             # CORRECT - filter depth is enforced
             assert "depth" in str(e).lower(), f"Unexpected error: {e}"
 
-    def test_field_depth_should_be_checked(self):
+    def test_field_depth_should_be_checked(self, deep_paths):
         """
         Test that field paths ARE checked against MAX_RELATION_DEPTH.
 
         Expected (after fix): Deep field paths rejected
         Actual (before fix): No depth check on fields
         """
-        from django_flex.fields import expand_fields
-        from django_flex.conf import flex_settings
-
         max_depth = flex_settings.MAX_RELATION_DEPTH
 
-        # Create a field path that exceeds depth
-        deep_field = ".".join(["relation"] * (max_depth + 2)) + ".name"
+        # A field path that exceeds depth
+        deep_field = deep_paths["field"]
 
         mock_model = MagicMock()
         mock_model.__name__ = "TestModel"
@@ -114,21 +124,19 @@ class TestH5RelationDepth:
             # CORRECT behavior after fix - deep fields rejected
             pass
 
-    def test_depth_check_consistency(self):
+    def test_depth_check_consistency(self, deep_paths):
         """
         Test that filters and fields have consistent depth checking.
 
         Both should use the same MAX_RELATION_DEPTH setting.
         """
-        from django_flex.conf import flex_settings
-
         max_depth = flex_settings.MAX_RELATION_DEPTH
 
-        # Construct paths at exactly max depth (should be allowed)
-        allowed_depth_path = ".".join(["rel"] * max_depth) + ".field"
+        # Path at exactly max depth (should be allowed)
+        allowed_depth_path = deep_paths["allowed"]
 
-        # Construct paths at max_depth + 1 (should be rejected)
-        rejected_depth_path = ".".join(["rel"] * (max_depth + 1)) + ".field"
+        # Path at max_depth + 1 (should be rejected)
+        rejected_depth_path = deep_paths["rejected"]
 
         # Count dots to verify our test data
         allowed_dots = allowed_depth_path.count(".")
@@ -143,15 +151,12 @@ class TestH5RelationDepth:
 
         Expected: Fields with depth > MAX_RELATION_DEPTH are rejected
         """
-        from django_flex.permissions import check_permission
-        from django_flex.conf import flex_settings
-        from unittest.mock import MagicMock
-
         max_depth = flex_settings.MAX_RELATION_DEPTH
 
         # Deep field path
-        deep_field = "customer.company.parent.owner.manager.secretary.phone"
-        depth = deep_field.count(".")  # 6 levels deep
+        relations = ["customer", "company", "parent", "owner", "manager", "secretary"]
+        deep_field = ".".join(relations) + ".phone"
+        depth = len(relations)  # 6 levels deep
 
         permissions = {
             "booking": {
@@ -236,6 +241,7 @@ def setup_db(db):
     pass
 
 
+@pytest.mark.skipif(not TEST_CASES, reason="no H5 integration cases yet")
 @pytest.mark.django_db
 def test_h5_relation_depth(setup_db, subtests):
     """Run all H5 security test cases."""
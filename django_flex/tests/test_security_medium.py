@@ -13,11 +13,13 @@ These tests verify security aspects that are important but not critical.
 Related Issues: #7, #8, #9, #10, #11
 """
 
+import re
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import patch, MagicMock
-from django.test import RequestFactory
+from unittest.mock import patch
 
-from django_flex.tests.test_utils import run_tests
+from django_flex.tests.test_utils import cached_source, run_tests
 
 
 # =============================================================================
@@ -29,6 +31,12 @@ state = {
 }
 
 
+# 'except Exception:' whose body is a bare, uncommented 'pass' (up to one blank line between)
+_BARE_EXCEPT_PASS = re.compile(
+    r"except\s+Exception\s*:[^\n]*\n(?:[ \t]*\n)?[ \t]*pass[ \t]*$", re.MULTILINE
+)
+
+
 # =============================================================================
 # TEST CASES
 # =============================================================================
@@ -60,7 +68,7 @@ class TestM1RateLimitBypass:
     which can be easily spoofed by attackers.
     """
 
-    def test_get_client_ip_uses_remote_addr_by_default(self):
+    def test_get_client_ip_uses_remote_addr_by_default(self, request_factory):
         """
         Test that client IP uses REMOTE_ADDR by default, not spoofable header.
 
@@ -69,8 +77,7 @@ class TestM1RateLimitBypass:
         """
         from django_flex.ratelimit import _get_client_ip
 
-        factory = RequestFactory()
-        request = factory.get("/")
+        request = request_factory.get("/")
 
         # Set REMOTE_ADDR (real IP from socket)
         request.META["REMOTE_ADDR"] = "10.0.0.1"
@@ -88,25 +95,22 @@ class TestM1RateLimitBypass:
                 "curl -H 'X-Forwarded-For: random-ip' ..."
             )
 
-    def test_rate_limit_not_bypassable_via_header(self):
+    @pytest.mark.parametrize("spoofed", [f"192.168.1.{i}" for i in range(10)])
+    def test_rate_limit_not_bypassable_via_header(self, request_factory, spoofed):
         """
         Test that rotating X-Forwarded-For doesn't bypass rate limit.
         """
-        from django_flex.ratelimit import check_rate_limit, _get_client_ip
-
-        factory = RequestFactory()
+        from django_flex.ratelimit import _get_client_ip
 
-        # Simulate multiple requests with different spoofed IPs
-        for i in range(10):
-            request = factory.get("/")
-            request.META["REMOTE_ADDR"] = "10.0.0.1"  # Same real IP
-            request.META["HTTP_X_FORWARDED_FOR"] = f"192.168.1.{i}"  # Different spoofed
+        request = request_factory.get("/")
+        request.META["REMOTE_ADDR"] = "10.0.0.1"  # Same real IP
+        request.META["HTTP_X_FORWARDED_FOR"] = spoofed  # Different spoofed
 
-            ip = _get_client_ip(request)
+        ip = _get_client_ip(request)
 
-            # All should resolve to same IP (10.0.0.1)
-            if ip != "10.0.0.1":
-                pytest.fail(f"M1 VULNERABILITY: Request {i} got IP {ip} from spoofed header. " "Each spoofed IP gets fresh rate limit counter!")
+        # Every spoofed header should resolve to the same IP (10.0.0.1)
+        if ip != "10.0.0.1":
+            pytest.fail(f"M1 VULNERABILITY: Request from {spoofed} got IP {ip} from spoofed header. " "Each spoofed IP gets fresh rate limit counter!")
 
 
 # =============================================================================
@@ -120,7 +124,7 @@ class TestM2SilentExceptions:
     hiding security-relevant errors and making debugging impossible.
     """
 
-    def test_token_auth_logs_errors(self):
+    def test_token_auth_logs_errors(self, request_factory):
         """
         Test that token authentication errors are logged.
 
@@ -135,8 +139,7 @@ class TestM2SilentExceptions:
 
         with patch.object(logger, "warning") as mock_warning:
             with patch.object(logger, "debug") as mock_debug:
-                factory = RequestFactory()
-                request = factory.post("/", {"__token": "invalid-token"})
+                request = request_factory.post("/", {"__token": "invalid-token"})
 
                 middleware = FlexQueryMiddleware(lambda r: r)
 
@@ -153,24 +156,16 @@ class TestM2SilentExceptions:
         """
         Test that specific exceptions are caught, not bare 'except Exception'.
         """
-        import inspect
         from django_flex.middleware import FlexQueryMiddleware
 
-        source = inspect.getsource(FlexQueryMiddleware)
+        source = cached_source(FlexQueryMiddleware)
 
         # Check for bare except
-        if "except Exception:" in source and "pass" in source:
-            # Could be a vulnerability - check context
-            lines = source.split("\n")
-            for i, line in enumerate(lines):
-                if "except Exception:" in line:
-                    # Check if next non-empty line is 'pass'
-                    for j in range(i + 1, min(i + 3, len(lines))):
-                        if "pass" in lines[j] and "#" not in lines[j]:
-                            pytest.fail(
-                                "M2 VULNERABILITY: 'except Exception: pass' found in middleware. "
-                                "This silently swallows all errors including ImportError, DatabaseError, etc."
-                            )
+        if _BARE_EXCEPT_PASS.search(source):
+            pytest.fail(
+                "M2 VULNERABILITY: 'except Exception: pass' found in middleware. "
+                "This silently swallows all errors including ImportError, DatabaseError, etc."
+            )
 
 
 # =============================================================================
@@ -265,9 +260,8 @@ class TestM4AllowedModels:
         Test that allowed_models check is not skipped when list is empty.
         """
         from django_flex.views import FlexModelView
-        import inspect
 
-        source = inspect.getsource(FlexModelView.get_model)
+        source = cached_source(FlexModelView.get_model)
 
         # Check for the buggy pattern: if self.allowed_models and ...
         if "if self.allowed_models and" in source or "if self.allowed_models:" in source:
@@ -280,6 +274,12 @@ class TestM4AllowedModels:
 # =============================================================================
 # M5: Superuser Access Documentation Tests
 # =============================================================================
+@pytest.fixture
+def superuser():
+    """Plain authenticated superuser; function-scoped since role lookups memoize on it."""
+    return SimpleNamespace(pk=1, id=1, is_authenticated=True, is_superuser=True, is_staff=False)
+
+
 class TestM5SuperuserDocs:
     """
     Tests for M5: Superuser cannot access unconfigured models.
@@ -288,18 +288,13 @@ class TestM5SuperuserDocs:
     Tests verify the behavior is as expected (deny by default).
     """
 
-    def test_superuser_denied_unconfigured_model(self):
+    def test_superuser_denied_unconfigured_model(self, superuser):
         """
         Test that superuser is denied access to models not in PERMISSIONS.
 
         This is CORRECT behavior (deny by default) but may surprise developers.
         """
         from django_flex.permissions import check_permission
-        from unittest.mock import MagicMock
-
-        superuser = MagicMock()
-        superuser.is_superuser = True
-        superuser.is_authenticated = True
 
         permissions = {
             # 'unconfigured_model' is NOT here
@@ -317,18 +312,13 @@ class TestM5SuperuserDocs:
             # CORRECT - superuser still needs model to be configured
             pass
 
-    def test_superuser_bypasses_within_configured_model(self):
+    def test_superuser_bypasses_within_configured_model(self, superuser):
         """
         Test that superuser with '*' config bypasses field/row restrictions.
         """
         from django_flex.permissions import check_permission
-        from unittest.mock import MagicMock
         from django.db.models import Q
 
-        superuser = MagicMock()
-        superuser.is_superuser = True
-        superuser.is_authenticated = True
-
         permissions = {
             "user": {
                 "superuser": "*",  # Full bypass
@@ -3,29 +3,89 @@ Test utilities for django-flex security testing.
 
 This testing framework follows the EliteSuite pattern:
 - TEST_CASES array containing test definitions
-- State dict for variable capture via !var syntax
+- State dict for variable capture via ref()/Capture() (or the "!var" syntax)
 - run_tests() executor with subtests support
+- case_params() / run_single_test() for one pytest node per case
 - Setup functions for pre-test configuration
 
-Test case format:
+Test case format (a dict, or a SecurityTestCase with the same fields):
 {
     "name": "Test case name",
     "setup": callable,       # Optional: function(state) called before test
     "req": { ... },          # Request payload (dict for JSON POST)
     "res": { ... },          # Expected response schema
     "status": 200,           # Optional: expected HTTP status (default 200)
-    "!var_name": "field",    # Capture response["field"] into state["var_name"]
+    Capture("var_name"): "field",  # Capture response["field"] into state["var_name"]
     "expect_error": True,    # If True, test expects failure (for security tests)
+    "fixtures": {"key": "fixture_name"},  # Optional: state["key"] = fixture value
 }
 
 Security tests are designed to FAIL when vulnerabilities exist,
 and PASS once fixes are applied.
 """
 
+import inspect
+from collections import namedtuple
+from functools import lru_cache
+from itertools import groupby
+
 import pytest
 from django.test import Client
 
-client = Client()
+from django_flex import jsonutils
+
+# CSRF checks stay off here; the H2 tests build their own enforcing clients
+client = Client(enforce_csrf_checks=False)
+
+# Typed test case for parametrized runners; None fields are treated as absent.
+# Captures are only supported by the dict format.
+SecurityTestCase = namedtuple(
+    "SecurityTestCase",
+    ["name", "setup", "req", "res", "status", "headers", "expect_error", "fixtures"],
+    defaults=(None, {}, None, 200, {}, False, {}),
+)
+
+
+def _case_dict(case):
+    """Return a test case as a dict (SecurityTestCase or dict input)."""
+    if isinstance(case, SecurityTestCase):
+        return {key: value for key, value in case._asdict().items() if value is not None}
+    return case
+
+
+class Ref:
+    """Request value replaced by state[name] when the case runs (same as "!name")."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"ref({self.name!r})"
+
+
+class Capture(namedtuple("Capture", ["name"])):
+    """Test case key capturing a response field into state[name] (same as "!name")."""
+
+    __slots__ = ()
+
+
+def ref(name):
+    """Reference state[name] from a req or headers value."""
+    return Ref(name)
+
+
+@lru_cache(maxsize=None)
+def cached_source(obj):
+    """Return inspect.getsource(obj), read and tokenized once per object."""
+    return inspect.getsource(obj)
+
+
+@lru_cache(maxsize=256)
+def _to_meta(name):
+    """Return the WSGI environ key for an HTTP header name (X-CSRFToken -> HTTP_X_CSRFTOKEN)."""
+    return "HTTP_" + name.upper().replace("-", "_")
 
 
 def api(payload, headers=None, endpoint="/api/"):
@@ -39,63 +99,129 @@ def api(payload, headers=None, endpoint="/api/"):
     Returns:
         Django test client response
     """
-    default_headers = {}
-    if headers:
-        default_headers.update(headers)
-
-    response = client.post(
-        endpoint,
-        data=payload,
-        content_type="application/json",
-        **{f"HTTP_{k.upper().replace('-', '_')}": v for k, v in default_headers.items()},
-    )
+    meta = {_to_meta(name): value for name, value in headers.items()} if headers else {}
+
+    # Pre-encoded so the client posts the bytes as-is (orjson when installed)
+    body = jsonutils.dumps(payload)
+    response = client.generic("POST", endpoint, body, "application/json", **meta)
     return response
 
 
-def validate_response(response_data, expected_schema):
-    """
-    Validate response data against expected schema.
+def _compile_missing(path):
+    """Compile the checker reporting a schema key absent from the response."""
 
-    Schema can contain:
-    - Exact values: {"field": "expected_value"}
-    - Type checks: {"field": str}
-    - Callables: {"field": lambda x: x > 0}
-    - Nested dicts: {"nested": {"field": str}}
+    def check(data, errors):
+        errors.append(f"{path}: missing key")
 
-    Returns:
-        Tuple of (is_valid, errors_list)
+    return check
+
+
+def _compile_schema(schema, path=""):
     """
-    errors = []
+    Compile a response schema into a node checker, once per schema node.
 
-    def check(data, schema, path=""):
-        if isinstance(schema, dict):
+    Each checker is check(data, errors) and returns the (data, checker) pairs
+    for nested dicts, so validate_response can walk them without recursion.
+    The schema kind is decided here rather than on every validation.
+    """
+    if isinstance(schema, dict):
+        children = []
+        for key, expected in schema.items():
+            full_path = f"{path}.{key}" if path else key
+            child = _compile_schema(expected, full_path)
+            children.append((key, _compile_missing(full_path), child))
+
+        def check(data, errors):
             if not isinstance(data, dict):
                 errors.append(f"{path}: expected dict, got {type(data).__name__}")
-                return
-            for key, expected in schema.items():
-                full_path = f"{path}.{key}" if path else key
-                if key not in data:
-                    errors.append(f"{full_path}: missing key")
-                    continue
-                check(data[key], expected, full_path)
-        elif isinstance(schema, type):
+                return None
+            # Missing keys are queued too, so errors keep schema order
+            return [
+                (data[key], child) if key in data else (None, missing)
+                for key, missing, child in children
+            ]
+
+    elif isinstance(schema, type):
+
+        def check(data, errors):
             if not isinstance(data, schema):
                 errors.append(f"{path}: expected {schema.__name__}, got {type(data).__name__}")
-        elif callable(schema):
+
+    elif callable(schema):
+
+        def check(data, errors):
             try:
                 if not schema(data):
                     errors.append(f"{path}: callable check failed")
             except Exception as e:
                 errors.append(f"{path}: callable raised {e}")
-        else:
-            # Exact value match
+
+    else:
+        # Exact value match
+        def check(data, errors):
             if data != schema:
                 errors.append(f"{path}: expected {schema!r}, got {data!r}")
 
-    check(response_data, expected_schema)
+    return check
+
+
+# id(schema) -> (schema, compiled checker); holding the schema keeps its id unique
+_compiled_schemas = {}
+
+
+def validate_response(response_data, expected_schema):
+    """
+    Validate response data against expected schema.
+
+    Schema can contain:
+    - Exact values: {"field": "expected_value"}
+    - Type checks: {"field": str}
+    - Callables: {"field": lambda x: x > 0}
+    - Nested dicts: {"nested": {"field": str}}
+
+    Returns:
+        Tuple of (is_valid, errors_list)
+    """
+    entry = _compiled_schemas.get(id(expected_schema))
+    if entry is None or entry[0] is not expected_schema:
+        entry = (expected_schema, _compile_schema(expected_schema))
+        _compiled_schemas[id(expected_schema)] = entry
+
+    errors = []
+    # Explicit DFS stack; nested checks are pushed in reverse so errors come out in schema order
+    stack = [(response_data, entry[1])]
+    while stack:
+        data, check = stack.pop()
+        nested = check(data, errors)
+        if nested:
+            stack.extend(reversed(nested))
+
     return len(errors) == 0, errors
 
 
+def case_params(test_cases):
+    """
+    Build pytest parameters for a TEST_CASES list.
+
+    Each case becomes its own test node named after case["name"]; cases with
+    expect_error=True are marked xfail until the vulnerability is fixed.
+
+    Usage:
+        @pytest.mark.parametrize("case", case_params(TEST_CASES))
+        def test_h1_hardcoded_session(case):
+            run_single_test(case, state)
+    """
+    params = []
+    for case in test_cases:
+        fields = _case_dict(case)
+        marks = ()
+        if fields.get("expect_error"):
+            # Only assertion failures count as the known issue; crashes still fail
+            marks = pytest.mark.xfail(raises=AssertionError, reason="security issue not fixed yet", strict=False)
+        params.append(pytest.param(case, id=fields["name"], marks=marks))
+    return params
+
+
 def run_tests(test_cases, state, subtests, permissions=None, endpoint="/api/"):
     """
     Generic test runner for API integration tests.
@@ -115,87 +241,169 @@ def run_tests(test_cases, state, subtests, permissions=None, endpoint="/api/"):
             "res": { ... },         # Expected response schema
             "status": 200,          # Optional: expected HTTP status (default 200)
             "headers": {},          # Optional: HTTP headers
-            "!var_name": "field",   # Capture response["field"] into state["var_name"]
+            Capture("var_name"): "field",  # Capture response["field"] into state["var_name"]
             "expect_error": True,   # If True, expect this test to fail (security test)
         }
 
     Special syntax:
-        - "!var" in req values: replaced with state["var"]
-        - "!key": "field" in test case: captures response["field"] into state["key"]
+        - ref("var") in req/headers values: replaced with state["var"]
+        - Capture("key"): "field" in test case: captures response["field"] into state["key"]
+        - The older "!var" value and "!key" key strings work the same way
         - "setup": callable: function called with state dict before request
     """
-    for case in test_cases:
-        name = case["name"]
-        with subtests.test(msg=name):
-            print(f"Running test case: {name}")
-
-            # Handle special setup actions
-            if "setup" in case:
-                setup_func = case["setup"]
-                if callable(setup_func):
-                    setup_func(state)
-                else:
-                    raise ValueError(f"Setup must be a callable function, got: {type(setup_func)}")
-
-            req = case.get("req", {}).copy()
-            headers = case.get("headers", {}).copy()
-
-            # Injection: Replace values starting with '!' with variables from state
-            for key, value in req.items():
-                if isinstance(value, str) and value.startswith("!"):
-                    var_name = value[1:]
-                    if var_name in state:
-                        req[key] = state[var_name]
-                    else:
-                        pytest.fail(f"Unknown state variable: {var_name}")
-
-            for key, value in headers.items():
-                if isinstance(value, str) and value.startswith("!"):
-                    var_name = value[1:]
-                    if var_name in state:
-                        headers[key] = state[var_name]
-                    else:
-                        pytest.fail(f"Unknown state variable: {var_name}")
-
-            response = api(req, headers=headers, endpoint=endpoint)
-
-            # Verify status code
-            expected_status = case.get("status", 200)
-
-            expect_error = case.get("expect_error", False)
-
-            if expect_error:
+    for batchable, group in groupby(test_cases, key=_is_batchable):
+        group = list(group)
+        if batchable and len(group) > 1:
+            _run_batch(group, state, subtests, permissions, endpoint)
+            continue
+
+        for case in group:
+            fields = _case_dict(case)
+            name = fields["name"]
+            with subtests.test(msg=name):
+                if not fields.get("expect_error", False):
+                    run_single_test(case, state, permissions, endpoint)
+                    continue
+
                 # For security tests, we expect certain tests to fail until fixed
                 # This inverts the assertion - test passes if response indicates error/failure
                 try:
-                    assert response.status_code == expected_status, f"Case '{name}' failed. Status {response.status_code} != {expected_status}"
-
-                    response_data = response.json()
-
-                    if "res" in case:
-                        is_valid, errors = validate_response(response_data, case["res"])
-                        assert is_valid, f"Case '{name}' schema validation failed: {errors}. Response: {response_data}"
+                    run_single_test(case, state, permissions, endpoint)
                 except AssertionError:
                     # For expect_error tests, assertion failure means security issue exists
                     # Mark as passed (the security issue is detected)
-                    pytest.skip(f"SECURITY ISSUE DETECTED: {name} - vulnerability exists, will pass after fix")
-            else:
-                assert (
-                    response.status_code == expected_status
-                ), f"Case '{name}' failed. Status {response.status_code} != {expected_status}. Content: {response.content}"
-
-                response_data = response.json()
-
-                # Validate response schema
-                if "res" in case:
-                    is_valid, errors = validate_response(response_data, case["res"])
-                    assert is_valid, f"Case '{name}' schema validation failed: {errors}. Response: {response_data}"
-
-                # Extraction: Capture values defined in test case keys starting with '!'
-                for key, target_field in case.items():
-                    if key.startswith("!"):
-                        var_name = key[1:]
-                        if target_field in response_data:
-                            state[var_name] = response_data[target_field]
-                        else:
-                            pytest.fail(f"Could not extract '{target_field}' to '{var_name}'. Field not found in response.")
+                    pytest.skip(
+                        f"SECURITY ISSUE DETECTED: {name} - vulnerability exists, will pass after fix"
+                    )
+
+
+def _is_batchable(case):
+    """
+    True for cases that neither touch state nor invert assertions.
+
+    No setup, fixtures or captures, and not expect_error; reading state via
+    ref()/"!var" is fine since batches keep the original case order.
+    """
+    fields = _case_dict(case)
+    if fields.get("setup") or fields.get("fixtures") or fields.get("expect_error"):
+        return False
+    return not any(
+        type(key) is Capture or (isinstance(key, str) and key.startswith("!")) for key in fields
+    )
+
+
+def _run_batch(cases, state, subtests, permissions, endpoint):
+    """Run consecutive batchable cases in one subtest, reporting every failure together."""
+    names = [_case_dict(case)["name"] for case in cases]
+    with subtests.test(msg=f"{names[0]} .. {names[-1]} ({len(names)} cases)"):
+        failures = []
+        for name, case in zip(names, cases):
+            try:
+                run_single_test(case, state, permissions, endpoint)
+            except (AssertionError, pytest.fail.Exception) as e:
+                failures.append(f"{name}: {e}")
+            except Exception as e:
+                # A crash in one case must not hide the results of the rest
+                failures.append(f"{name}: {type(e).__name__}: {e}")
+        assert not failures, "\n".join(failures)
+
+
+# id(mapping) -> (mapping, [(key, var_name), ...]); holding the mapping keeps its id unique
+_substitution_plans = {}
+
+
+def _substitute(mapping, state):
+    """
+    Return mapping with ref("var") / "!var" values replaced by state["var"].
+
+    Mappings without references are returned as-is (callers only read them);
+    otherwise the result is a copy.
+
+    Which keys hold references is worked out once per mapping object,
+    so TEST_CASES reused across runs skip the per-value string checks.
+    """
+    if not mapping:
+        return {}
+    entry = _substitution_plans.get(id(mapping))
+    if entry is None or entry[0] is not mapping:
+        plan = []
+        for key, value in mapping.items():
+            if type(value) is Ref:
+                plan.append((key, value.name))
+            elif isinstance(value, str) and value.startswith("!"):
+                plan.append((key, value[1:]))
+        entry = _substitution_plans[id(mapping)] = (mapping, plan)
+
+    if not entry[1]:
+        return mapping
+    result = dict(mapping)
+    for key, var_name in entry[1]:
+        if var_name not in state:
+            pytest.fail(f"Unknown state variable: {var_name}")
+        result[key] = state[var_name]
+    return result
+
+
+def run_single_test(case, state, permissions=None, endpoint="/api/", request=None):
+    """
+    Run one test case dictionary or SecurityTestCase (see run_tests for the format).
+
+    Assertions are not inverted for expect_error cases; parametrized tests
+    mark those xfail via case_params instead.
+
+    Args:
+        case: Test case dictionary
+        state: Dictionary holding test state variables
+        permissions: Optional permissions config to use
+        endpoint: API endpoint path
+        request: pytest request, required when the case lists "fixtures"
+    """
+    case = _case_dict(case)
+    name = case["name"]
+    expected_status = case.get("status", 200)
+    expect_error = case.get("expect_error", False)
+    print(f"Running test case: {name}")
+
+    # Fixture injection: per-test values instead of module-global setup state
+    for key, fixture_name in case.get("fixtures", {}).items():
+        state[key] = request.getfixturevalue(fixture_name)
+
+    # Handle special setup actions
+    if "setup" in case:
+        setup_func = case["setup"]
+        if callable(setup_func):
+            setup_func(state)
+        else:
+            raise ValueError(f"Setup must be a callable function, got: {type(setup_func)}")
+
+    # Injection: Replace ref("var") / "!var" values with variables from state
+    req = _substitute(case.get("req") or {}, state)
+    headers = _substitute(case.get("headers") or {}, state)
+
+    response = api(req, headers=headers, endpoint=endpoint)
+
+    # Verify status code
+    assert (
+        response.status_code == expected_status
+    ), f"Case '{name}' failed. Status {response.status_code} != {expected_status}. Content: {response.content}"
+
+    response_data = jsonutils.loads(response.content)
+
+    # Validate response schema
+    if "res" in case:
+        is_valid, errors = validate_response(response_data, case["res"])
+        assert is_valid, f"Case '{name}' schema validation failed: {errors}. Response: {response_data}"
+
+    # Extraction: Capture values defined by Capture("var") / "!var" test case keys
+    # (expect_error cases never feed later cases)
+    if expect_error:
+        return
+    captures = [
+        (key.name if type(key) is Capture else key[1:], target_field)
+        for key, target_field in case.items()
+        if type(key) is Capture or (isinstance(key, str) and key.startswith("!"))
+    ]
+    for var_name, target_field in captures:
+        if target_field not in response_data:
+            pytest.fail(f"Could not extract '{target_field}' to '{var_name}'. Field not found in response.")
+        state[var_name] = response_data[target_field]
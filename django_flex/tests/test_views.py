@@ -0,0 +1,208 @@
+"""
+Tests for django_flex.views.
+
+Tests cover:
+- Query spec parsing in FlexQueryView.get_query_spec
+- Permissions dict reuse in _build_permissions_dict
+- FlexModelView allowed_models checks
+- CSRF_EXEMPT handling in as_view
+- MAX_BODY_BYTES and rate-limit rejections in handle_query
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.models import User
+
+from django_flex.views import FlexModelView, FlexQueryView
+
+
+@pytest.fixture
+def view():
+    view = FlexQueryView()
+    view.kwargs = {}
+    return view
+
+
+class TestGetQuerySpec:
+    """Tests for FlexQueryView.get_query_spec."""
+
+    def test_json_body_parsed(self, view, request_factory):
+        """A JSON body becomes the query spec as-is."""
+        body = {"fields": "id, name", "filters": {"status": "active"}, "limit": 5}
+        request = request_factory.post("/", data=json.dumps(body), content_type="application/json")
+
+        assert view.get_query_spec(request) == body
+
+    def test_invalid_json_body_on_post_rejected(self, view, request_factory):
+        """A malformed POST body is not a query spec."""
+        request = request_factory.post("/", data="{not json", content_type="application/json")
+
+        assert view.get_query_spec(request) is None
+
+    def test_get_query_params_parsed(self, view, request_factory):
+        """GET without a body reads fields, JSON filters and integer paging from the query string."""
+        request = request_factory.get(
+            "/", {"fields": "id", "filters": '{"status": "active"}', "limit": "10", "offset": "x"}
+        )
+
+        spec = view.get_query_spec(request)
+
+        assert spec == {"fields": "id", "filters": {"status": "active"}, "limit": 10}
+
+    def test_invalid_filters_param_becomes_empty(self, view, request_factory):
+        """Malformed JSON in the filters param is dropped rather than failing the request."""
+        request = request_factory.get("/", {"filters": "{bad"})
+
+        assert view.get_query_spec(request) == {"filters": {}}
+
+    def test_post_ignores_query_params(self, view, request_factory):
+        """POST specs come from the body only, never from the query string."""
+        request = request_factory.post("/?limit=3", data="{}", content_type="application/json")
+
+        assert view.get_query_spec(request) == {}
+
+    def test_url_pk_sets_id(self, view, request_factory):
+        """A pk URL kwarg selects a single object."""
+        view.kwargs = {"pk": 7}
+        request = request_factory.get("/")
+
+        assert view.get_query_spec(request) == {"id": 7}
+
+
+class _Booking:
+    pass
+
+
+class _Customer:
+    pass
+
+
+class TestBuildPermissionsDict:
+    """Tests for FlexQueryView._build_permissions_dict."""
+
+    def test_keyed_by_lowercase_model_name(self, view):
+        """The view's permissions are filed under its model's lowercase name."""
+        view.model = _Booking
+        perms = {"owner": {"fields": ["*"], "ops": ["get"]}}
+
+        assert view._build_permissions_dict(perms) == {"_booking": perms}
+
+    def test_reused_for_same_permissions(self, view):
+        """Repeated requests with the same permissions object share one dict."""
+        perms = {"owner": {"fields": ["*"], "ops": ["get"]}}
+
+        first = view._build_permissions_dict(perms, _Booking)
+
+        assert view._build_permissions_dict(perms, _Booking) is first
+
+    def test_rebuilt_for_new_permissions_or_model(self, view):
+        """A different permissions object or model gets its own dict."""
+        perms = {"owner": {"fields": ["*"], "ops": ["get"]}}
+        first = view._build_permissions_dict(perms, _Booking)
+
+        rebuilt = view._build_permissions_dict(dict(perms), _Booking)
+        other_model = view._build_permissions_dict(perms, _Customer)
+
+        assert rebuilt is not first
+        assert other_model == {"_customer": perms}
+
+
+class TestFlexModelViewGetModel:
+    """Tests for FlexModelView.get_model allowed_models handling."""
+
+    def test_allowed_model_matched_case_insensitively(self):
+        """Allowed names and URL names are compared lowercased."""
+
+        class UserView(FlexModelView):
+            allowed_models = ["User"]
+
+        view = UserView()
+        view.kwargs = {"model_name": "USER"}
+
+        assert view.get_model() is User
+
+    def test_model_outside_allowed_models_rejected(self):
+        """URL models missing from allowed_models resolve to None."""
+
+        class GroupView(FlexModelView):
+            allowed_models = ["group"]
+
+        view = GroupView()
+        view.kwargs = {"model_name": "user"}
+
+        assert view.get_model() is None
+
+    def test_instance_allowed_models_override(self):
+        """allowed_models passed through as_view initkwargs replace the class list."""
+
+        class GroupView(FlexModelView):
+            allowed_models = ["group"]
+
+        view = GroupView(allowed_models=["user"])
+        view.kwargs = {"model_name": "user"}
+
+        assert view.get_model() is User
+
+
+class TestAsViewCsrf:
+    """Tests for the CSRF_EXEMPT decision in FlexQueryView.as_view."""
+
+    @pytest.mark.parametrize("exempt", [True, False])
+    def test_csrf_exempt_follows_setting(self, monkeypatch, exempt):
+        """The view is marked exempt only when CSRF_EXEMPT is set, without an extra wrapper."""
+        import django_flex.views as views_module
+
+        monkeypatch.setattr(views_module, "flex_settings", SimpleNamespace(CSRF_EXEMPT=exempt))
+        view = FlexQueryView.as_view()
+
+        assert getattr(view, "csrf_exempt", False) is exempt
+        assert view.view_class is FlexQueryView
+
+
+class TestHandleQueryRejections:
+    """Tests for the early rejections in FlexQueryView.handle_query."""
+
+    def test_oversize_body_rejected_before_parsing(self, view, request_factory, monkeypatch):
+        """Bodies over MAX_BODY_BYTES never reach get_query_spec."""
+        import django_flex.middleware as middleware_module
+
+        monkeypatch.setattr(middleware_module, "flex_settings", SimpleNamespace(MAX_BODY_BYTES=16))
+        view.model = User
+        view.require_auth = False
+        view.get_query_spec = lambda request: pytest.fail("body was parsed")
+        body = json.dumps({"filters": {"id.in": list(range(50))}})
+        request = request_factory.post("/", data=body, content_type="application/json")
+
+        response = view.handle_query(request)
+
+        assert response.status_code == 413
+
+    def test_rate_limited_response(self, view, request_factory, monkeypatch):
+        """Denied requests get a 429 JSON body plus a Retry-After header."""
+        import django_flex.views as views_module
+
+        monkeypatch.setattr(views_module, "check_rate_limit", lambda *args: (False, 17))
+        view.model = User
+        view.require_auth = False
+        request = request_factory.get("/")
+
+        response = view.handle_query(request)
+
+        assert response.status_code == 429
+        assert response["Retry-After"] == "17"
+        assert json.loads(response.content) == {"error": "Rate limit exceeded", "retry_after": 17}
+
+    def test_non_string_order_by_denied(self, view, request_factory):
+        """A list order_by is refused with 403 instead of crashing the permission lookup."""
+        view.model = User
+        view.flex_permissions = {"staff": {"fields": ["id"], "ops": ["list"], "order_by": ["id"]}}
+        request = request_factory.post(
+            "/", data=json.dumps({"fields": "id", "order_by": ["id"]}), content_type="application/json"
+        )
+        request.user = SimpleNamespace(is_authenticated=True, is_superuser=False, is_staff=True)
+
+        response = view.handle_query(request)
+
+        assert response.status_code == 403
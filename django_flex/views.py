@@ -9,17 +9,28 @@ Features:
 - Configurable per-view settings
 """
 
-from django.http import JsonResponse
+from functools import lru_cache
+
+from django.http import HttpResponse
 from django.views import View
-from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
-import json
-
-from django_flex.query import FlexQuery
+from django_flex import jsonutils
+from django_flex.middleware import body_too_large
+from django_flex.query import FlexQuery, get_model_by_name
+from django_flex.ratelimit import check_rate_limit
 from django_flex.response import FlexResponse
 from django_flex.conf import flex_settings
 
+# Installed models don't change after startup, so name -> model lookups are memoized
+_resolve_model = lru_cache(maxsize=128)(get_model_by_name)
+
+# 429 body; retry_after is a whole number of seconds from check_rate_limit
+_RATE_LIMIT_BODY = b'{"error": "Rate limit exceeded", "retry_after": %d}'
+
+# (view class, model) -> (flex_permissions, permissions dict); see _build_permissions_dict
+_permissions_dicts = {}
+
 
 class FlexQueryView(View):
     """
@@ -76,9 +87,11 @@ class FlexQueryView(View):
     def as_view(cls, **initkwargs):
         """Override as_view to conditionally apply csrf_exempt based on settings."""
         view = super().as_view(**initkwargs)
-        # H2 fix: Only apply csrf_exempt if explicitly configured (secure by default)
+        # H2 fix: Only apply csrf_exempt if explicitly configured (secure by default).
+        # as_view() returns a fresh function, so mark it directly (the flag
+        # CsrfViewMiddleware reads) rather than paying csrf_exempt's wrapper per request.
         if flex_settings.CSRF_EXEMPT:
-            view = csrf_exempt(view)
+            view.csrf_exempt = True
         return view
 
     def get_model(self):
@@ -111,41 +124,18 @@ class FlexQueryView(View):
         """
         spec = {}
 
-        # Try to parse JSON body (works for both GET and POST)
+        # Try to parse JSON body (works for both GET and POST); bodiless GETs skip this
         if request.body:
             try:
-                spec = json.loads(request.body)
-            except json.JSONDecodeError:
+                spec = jsonutils.loads(request.body)
+            except jsonutils.JSONDecodeError:
                 # Fall back to query params for GET
                 if request.method != "GET":
                     return None
 
         # For GET without JSON body, parse query params
         if request.method == "GET" and not spec:
-            if "fields" in request.GET:
-                spec["fields"] = request.GET["fields"]
-            if "filters" in request.GET:
-                try:
-                    spec["filters"] = json.loads(request.GET["filters"])
-                except json.JSONDecodeError:
-                    spec["filters"] = {}
-            if "limit" in request.GET:
-                try:
-                    spec["limit"] = int(request.GET["limit"])
-                except ValueError:
-                    pass
-            if "offset" in request.GET:
-                try:
-                    spec["offset"] = int(request.GET["offset"])
-                except ValueError:
-                    pass
-            if "order_by" in request.GET:
-                spec["order_by"] = request.GET["order_by"]
-            if "id" in request.GET:
-                try:
-                    spec["id"] = int(request.GET["id"])
-                except ValueError:
-                    spec["id"] = request.GET["id"]
+            spec = self._parse_get_params(request.GET)
 
         # Check for pk in URL kwargs (e.g., /api/bookings/1)
         pk = self.kwargs.get("pk")
@@ -154,6 +144,35 @@ class FlexQueryView(View):
 
         return spec
 
+    def _parse_get_params(self, params):
+        """Build a query spec from GET query params (fields, filters, paging, order_by, id)."""
+        spec = {}
+        if "fields" in params:
+            spec["fields"] = params["fields"]
+        if "filters" in params:
+            try:
+                spec["filters"] = jsonutils.loads(params["filters"])
+            except jsonutils.JSONDecodeError:
+                spec["filters"] = {}
+        if "limit" in params:
+            try:
+                spec["limit"] = int(params["limit"])
+            except ValueError:
+                pass
+        if "offset" in params:
+            try:
+                spec["offset"] = int(params["offset"])
+            except ValueError:
+                pass
+        if "order_by" in params:
+            spec["order_by"] = params["order_by"]
+        if "id" in params:
+            try:
+                spec["id"] = int(params["id"])
+            except ValueError:
+                spec["id"] = params["id"]
+        return spec
+
     def post(self, request, *args, **kwargs):
         """Handle POST request for queries."""
         return self.handle_query(request)
@@ -177,6 +196,10 @@ class FlexQueryView(View):
         if model is None:
             return FlexResponse.error("MODEL_NOT_FOUND", "Model not configured").to_json_response()
 
+        # Oversize bodies are rejected before anything parses them
+        if body_too_large(request):
+            return FlexResponse.error("PAYLOAD_TOO_LARGE").to_json_response()
+
         # Get query spec
         query_spec = self.get_query_spec(request)
         if query_spec is None:
@@ -190,17 +213,14 @@ class FlexQueryView(View):
         # Check rate limit
         user = self.get_user(request)
         permissions = self.get_permissions()
-        permissions_dict = self._build_permissions_dict(permissions) if permissions else None
-
-        from django_flex.ratelimit import check_rate_limit
+        permissions_dict = self._build_permissions_dict(permissions, model) if permissions else None
 
         model_name = model.__name__.lower()
         allowed, retry_after = check_rate_limit(user, model_name, action, permissions_dict, request)
 
         if not allowed:
-            response = JsonResponse(
-                {"error": "Rate limit exceeded", "retry_after": retry_after},
-                status=429,
+            response = HttpResponse(
+                _RATE_LIMIT_BODY % retry_after, content_type="application/json", status=429
             )
             response["Retry-After"] = str(retry_after)
             return response
@@ -214,10 +234,23 @@ class FlexQueryView(View):
 
         return result.to_json_response()
 
-    def _build_permissions_dict(self, flex_permissions):
-        """Build a permissions dict compatible with the permission system."""
-        model_name = self.get_model().__name__.lower()
-        return {model_name: flex_permissions}
+    def _build_permissions_dict(self, flex_permissions, model=None):
+        """
+        Build a permissions dict compatible with the permission system.
+
+        The result is reused per (view class, model) for as long as the view
+        keeps returning the same flex_permissions object, so views that build
+        permissions per request still get a fresh dict.
+        """
+        if model is None:
+            model = self.get_model()
+        key = (type(self), model)
+        cached = _permissions_dicts.get(key)
+        if cached is not None and cached[0] is flex_permissions:
+            return cached[1]
+        permissions_dict = {model.__name__.lower(): flex_permissions}
+        _permissions_dicts[key] = (flex_permissions, permissions_dict)
+        return permissions_dict
 
 
 class FlexModelView(FlexQueryView):
@@ -241,14 +274,25 @@ class FlexModelView(FlexQueryView):
     # List of allowed model names (security measure)
     allowed_models = []
 
+    # (allowed_models, lowercased frozenset), computed once per subclass
+    _allowed_models_lower = (allowed_models, frozenset())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        allowed = cls.allowed_models
+        cls._allowed_models_lower = (allowed, frozenset(m.lower() for m in allowed))
+
     def get_model(self):
         """Get model from URL."""
         model_name = self.kwargs.get("model_name", "")
 
         # Security check: only allow configured models
-        if self.allowed_models and model_name.lower() not in [m.lower() for m in self.allowed_models]:
-            return None
-
-        from django_flex.query import get_model_by_name
-
-        return get_model_by_name(model_name)
+        if self.allowed_models:
+            source, allowed = self._allowed_models_lower
+            if source is not self.allowed_models:
+                # Overridden per instance (e.g. as_view(allowed_models=[...]))
+                allowed = frozenset(m.lower() for m in self.allowed_models)
+            if model_name.lower() not in allowed:
+                return None
+
+        return _resolve_model(model_name)
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import glob
+import json
 import os
 import sys
 import re
@@ -15,6 +17,11 @@ BUILD_DIR = os.path.join(PROJECT_ROOT, "build")
 EGG_INFO_PATTERN = os.path.join(PROJECT_ROOT, "*.egg-info")
 VENV_PYTHON = os.path.join(PROJECT_ROOT, ".venv", "bin", "python")
 
+# pyproject.toml fields
+NAME_RE = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+VERSION_RE = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+VERSION_SUB_RE = re.compile(r'^(version\s*=\s*")[^"]+(")', re.MULTILINE)
+
 def restart_in_venv():
     """Restart the script in the virtual environment if it exists and we're not already in it."""
     if os.path.exists(VENV_PYTHON):
@@ -46,11 +53,11 @@ def get_project_info():
     with open(PYPROJECT_FILE, "r") as f:
         content = f.read()
         
-    name_match = re.search(r'^name\s*=\s*"([^"]+)"', content, re.MULTILINE)
+    name_match = NAME_RE.search(content)
     if name_match:
         name = name_match.group(1)
         
-    version_match = re.search(r'^version\s*=\s*"([^"]+)"', content, re.MULTILINE)
+    version_match = VERSION_RE.search(content)
     if version_match:
         version = version_match.group(1)
         
@@ -60,20 +67,20 @@ def get_project_info():
         
     return name, version
 
-def version_exists_on_pypi(package_name, version):
-    """Check if a version exists on PyPI."""
-    url = f"https://pypi.org/pypi/{package_name}/{version}/json"
+def get_pypi_versions(package_name):
+    """Fetch the set of versions released on PyPI (one request for the whole index)."""
+    url = f"https://pypi.org/pypi/{package_name}/json"
     try:
         with urllib.request.urlopen(url) as response:
-            return response.getcode() == 200
+            return set(json.load(response)["releases"])
     except urllib.error.HTTPError as e:
         if e.code == 404:
-            return False
+            return set()
         print(f"Warning: Error checking PyPI ({e.code})")
-        return False
+        return set()
     except Exception as e:
         print(f"Warning: Error checking PyPI: {e}")
-        return False
+        return set()
 
 def bumps_version(current_version, package_name):
     """Calculate the next version using CalVer (YY.M.PATCH)."""
@@ -114,10 +121,10 @@ def bumps_version(current_version, package_name):
     candidate_patch = 0
     candidate_version = f"{current_year_short}.{current_month}.{candidate_patch}"
     
-    # Optimization: If current local version matches YY.M.*, start checking from there?
-    # But PyPI is the source of truth for "taken" versions.
-    
-    while version_exists_on_pypi(package_name, candidate_version):
+    # PyPI is the source of truth for "taken" versions; fetch them all once
+    released = get_pypi_versions(package_name)
+
+    while candidate_version in released:
         print(f"==> Version {candidate_version} exists on PyPI...")
         candidate_patch += 1
         candidate_version = f"{current_year_short}.{current_month}.{candidate_patch}"
@@ -129,12 +136,7 @@ def update_pyproject_file(new_version):
     with open(PYPROJECT_FILE, "r") as f:
         content = f.read()
         
-    new_content = re.sub(
-        r'^(version\s*=\s*")[^"]+(")',
-        f'\\g<1>{new_version}\\g<2>',
-        content,
-        flags=re.MULTILINE
-    )
+    new_content = VERSION_SUB_RE.sub(f'\\g<1>{new_version}\\g<2>', content)
     
     with open(PYPROJECT_FILE, "w") as f:
         f.write(new_content)
@@ -149,14 +151,10 @@ def clean():
     if os.path.exists(BUILD_DIR):
         shutil.rmtree(BUILD_DIR)
     
-    # pattern match for .egg-info is trickier with shutil, use glob or listdir
-    parent_dir = os.path.dirname(EGG_INFO_PATTERN)
-    if os.path.exists(parent_dir):
-        for name in os.listdir(parent_dir):
-            if name.endswith(".egg-info"):
-                path = os.path.join(parent_dir, name)
-                if os.path.isdir(path):
-                    shutil.rmtree(path)
+    # shutil can't match patterns; glob scans the directory once
+    for path in glob.glob(EGG_INFO_PATTERN):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
 
 def main():
     # Ensure we use the venv
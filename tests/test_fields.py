@@ -4,76 +4,47 @@ Tests for django_flex.fields module.
 
 import pytest
 
+from django_flex.fields import extract_relations, parse_fields
+
 
 class TestParseFields:
     """Tests for parse_fields function."""
 
-    def test_simple_fields(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("name, email")
-        assert result == ["name", "email"]
-
-    def test_dotted_fields(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("id, customer.name, customer.email")
-        assert result == ["id", "customer.name", "customer.email"]
-
-    def test_wildcard(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("*")
-        assert result == ["*"]
-
-    def test_relation_wildcard(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("id, customer.*")
-        assert result == ["id", "customer.*"]
-
-    def test_empty_returns_wildcard(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("")
-        assert result == ["*"]
-
-    def test_none_returns_wildcard(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields(None)
-        assert result == ["*"]
-
-    def test_strips_whitespace(self):
-        from django_flex.fields import parse_fields
-
-        result = parse_fields("  name  ,  email  ")
-        assert result == ["name", "email"]
+    @pytest.mark.parametrize(
+        "fields_str, expected",
+        [
+            pytest.param("name, email", ["name", "email"], id="simple_fields"),
+            pytest.param(
+                "id, customer.name, customer.email",
+                ["id", "customer.name", "customer.email"],
+                id="dotted_fields",
+            ),
+            pytest.param("*", ["*"], id="wildcard"),
+            pytest.param("id, customer.*", ["id", "customer.*"], id="relation_wildcard"),
+            pytest.param("", ["*"], id="empty_returns_wildcard"),
+            pytest.param(None, ["*"], id="none_returns_wildcard"),
+            pytest.param("  name  ,  email  ", ["name", "email"], id="strips_whitespace"),
+        ],
+    )
+    def test_parse_fields(self, fields_str, expected):
+        assert parse_fields(fields_str) == expected
 
 
 class TestExtractRelations:
     """Tests for extract_relations function."""
 
-    def test_no_relations(self):
-        from django_flex.fields import extract_relations
-
-        relations = extract_relations(["id", "status", "name"])
-        assert relations == set()
-
-    def test_single_relation(self):
-        from django_flex.fields import extract_relations
-
-        relations = extract_relations(["id", "customer.name", "customer.email"])
-        assert relations == {"customer"}
-
-    def test_nested_relation(self):
-        from django_flex.fields import extract_relations
-
-        relations = extract_relations(["id", "customer.address.city"])
-        assert relations == {"customer__address"}
-
-    def test_multiple_relations(self):
-        from django_flex.fields import extract_relations
-
-        relations = extract_relations(["id", "customer.name", "address.city", "cleaner.phone"])
-        assert relations == {"customer", "address", "cleaner"}
+    @pytest.mark.parametrize(
+        "fields, expected",
+        [
+            pytest.param(["id", "status", "name"], set(), id="no_relations"),
+            pytest.param(["id", "customer.name", "customer.email"], {"customer"}, id="single_relation"),
+            pytest.param(["id", "customer.address.city"], {"customer__address"}, id="nested_relation"),
+            pytest.param(
+                ["id", "customer.name", "address.city", "cleaner.phone"],
+                {"customer", "address", "cleaner"},
+                id="multiple_relations",
+            ),
+        ],
+    )
+    def test_extract_relations(self, fields, expected):
+        assert extract_relations(fields) == expected
@@ -2,28 +2,22 @@
 Tests for django_flex.response module.
 """
 
+from types import SimpleNamespace
+
 import pytest
 
+from django_flex.response import FlexResponse, build_nested_response
+
 
 class TestBuildNestedResponse:
     """Tests for build_nested_response function."""
 
     def test_none_object(self):
-        from django_flex.response import build_nested_response
-
         result = build_nested_response(None, ["email"])
         assert result is None
 
     def test_simple_object(self):
-        from django_flex.response import build_nested_response
-
-        # Create a simple mock object
-        class MockObj:
-            id = 1
-            name = "Test"
-            email = "test@example.com"
-
-        obj = MockObj()
+        obj = SimpleNamespace(id=1, name="Test", email="test@example.com")
         result = build_nested_response(obj, ["id", "name", "email"])
 
         assert result["id"] == 1
@@ -31,19 +25,8 @@ class TestBuildNestedResponse:
         assert result["email"] == "test@example.com"
 
     def test_nested_fields(self):
-        from django_flex.response import build_nested_response
-
-        # Create mock objects with nesting
-        class MockCustomer:
-            name = "Aisha Khan"
-            email = "aisha@example.com"
-
-        class MockBooking:
-            id = 1
-            status = "confirmed"
-            customer = MockCustomer()
-
-        obj = MockBooking()
+        customer = SimpleNamespace(name="Aisha Khan", email="aisha@example.com")
+        obj = SimpleNamespace(id=1, status="confirmed", customer=customer)
         result = build_nested_response(obj, ["id", "status", "customer.name", "customer.email"])
 
         assert result["id"] == 1
@@ -55,40 +38,36 @@ class TestBuildNestedResponse:
 class TestFlexResponse:
     """Tests for FlexResponse class."""
 
-    def test_ok_response(self):
-        from django_flex.response import FlexResponse
-
-        response = FlexResponse.ok(id=1, name="Test")
-        data = response.to_dict()
-
-        assert data["id"] == 1
-        assert data["name"] == "Test"
-
-    def test_error_response(self):
-        from django_flex.response import FlexResponse
-
-        response = FlexResponse.error("NOT_FOUND", "Object not found")
-        data = response.to_dict()
-
-        assert data["error"] == "Object not found"
-
-    def test_warning_response(self):
-        from django_flex.response import FlexResponse
-
-        response = FlexResponse.warning_response("LIMIT_CLAMPED", limit=200)
-        data = response.to_dict()
-
-        assert data["warning"] is True
-        assert data["warning_code"] == "LIMIT_CLAMPED"
-        assert data["limit"] == 200
-
-    def test_ok_query_response(self):
-        from django_flex.response import FlexResponse
-
-        results = {"1": {"id": 1}, "2": {"id": 2}}
-        pagination = {"offset": 0, "limit": 20, "has_more": False}
-        response = FlexResponse.ok_query(results=results, pagination=pagination)
-        data = response.to_dict()
-
-        assert data["results"] == results
-        assert data["pagination"] == pagination
+    @pytest.mark.parametrize(
+        "make, expected",
+        [
+            pytest.param(
+                lambda: FlexResponse.ok(id=1, name="Test"), {"id": 1, "name": "Test"}, id="ok"
+            ),
+            pytest.param(
+                lambda: FlexResponse.error("NOT_FOUND", "Object not found"),
+                {"error": "Object not found"},
+                id="error",
+            ),
+            pytest.param(
+                lambda: FlexResponse.warning_response("LIMIT_CLAMPED", limit=200),
+                {"warning": True, "warning_code": "LIMIT_CLAMPED", "limit": 200},
+                id="warning",
+            ),
+            pytest.param(
+                lambda: FlexResponse.ok_query(
+                    results={"1": {"id": 1}, "2": {"id": 2}},
+                    pagination={"offset": 0, "limit": 20, "has_more": False},
+                ),
+                {
+                    "results": {"1": {"id": 1}, "2": {"id": 2}},
+                    "pagination": {"offset": 0, "limit": 20, "has_more": False},
+                },
+                id="ok_query",
+            ),
+        ],
+    )
+    def test_response_to_dict(self, make, expected):
+        data = make().to_dict()
+
+        assert expected.items() <= data.items()